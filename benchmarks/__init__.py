@@ -0,0 +1 @@
+"""Micro-benchmarks of pulya internals."""
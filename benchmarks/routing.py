@@ -0,0 +1,54 @@
+"""
+Route matching benchmark.
+
+Measures static and dynamic path lookups on routers with 100, 1k and 10k
+routes, with and without the match cache::
+
+    python -m benchmarks.routing
+"""
+
+import sys
+import timeit
+from http import HTTPMethod
+
+from pulya.routing import Router
+
+ROUTE_COUNTS = (100, 1_000, 10_000)
+LOOKUPS = 100_000
+
+
+async def _handler() -> None:
+    """Route handler, never called."""
+
+
+def _build_router(count: int, match_cache_size: int) -> Router:
+    router = Router(match_cache_size=match_cache_size)
+    for i in range(count // 2):
+        router.add_route(HTTPMethod.GET, f"/static/{i}/", _handler)
+        router.add_route(HTTPMethod.GET, f"/dynamic/{i}/{{item_id}}", _handler)
+    return router
+
+
+def main() -> None:
+    for count in ROUTE_COUNTS:
+        for match_cache_size in (0, 1024):
+            router = _build_router(count, match_cache_size)
+            middle = count // 4
+            for kind, path in (
+                ("static", f"/static/{middle}/"),
+                ("dynamic", f"/dynamic/{middle}/42"),
+            ):
+                seconds = timeit.timeit(
+                    lambda path=path, router=router: router.match_route(
+                        HTTPMethod.GET, path
+                    ),
+                    number=LOOKUPS,
+                )
+                sys.stdout.write(
+                    f"{count:>6} routes  cache={match_cache_size:<5} {kind:<8}"
+                    f"{seconds / LOOKUPS * 1e9:8.1f} ns/lookup\n"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Request serving microbenchmark.
+
+Drives the example application through ``__rsgi__`` and ASGI ``__call__``
+with stub protocols, no sockets involved, and reports time and memory per
+request for every case::
+
+    python -m benchmarks.serving              # compare with stored baselines
+    python -m benchmarks.serving --save       # store new baselines
+
+CPython has no allocation counter, so memory is reported as the peak of
+memory traced by :py:mod:`tracemalloc` while serving a request and as
+memory blocks left allocated after it (anything above zero is growth).
+
+Baselines are machine specific: store them on the machine used to compare.
+Comparison exits with status 1 when time or peak memory of a case grew
+by more than `--tolerance`.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import msgspec
+from asgiref.typing import ASGIReceiveEvent, ASGISendEvent, HTTPScope
+
+from examples.simple_example import app
+from pulya.metrics import Metrics
+from pulya.rsgi import Scope
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+#: Time is the best of rounds, slower ones are disturbed by the system.
+ROUNDS = 7
+REQUESTS = 5_000
+MEMORY_REQUESTS = 200
+
+
+def _echo_body(items: int) -> bytes:
+    item = dict.fromkeys("abcdefg", "value")
+    return msgspec.json.encode({"items": [item] * items})
+
+
+class Case(NamedTuple):
+    name: str
+    method: str
+    path: str
+    query_string: str = ""
+    headers: tuple[tuple[str, str], ...] = ()
+    body: bytes = b""
+
+
+CASES = (
+    Case("dict", "GET", "/"),
+    Case("path_params", "GET", "/items/42"),
+    Case("query_params", "GET", "/search/books", "q=python&p=2&tags=a&tags=b"),
+    Case("di_wiring", "GET", "/wiring/john", headers=(("accept", "*/*"),)),
+    Case("header", "GET", "/headers/", headers=(("x-example", "value"),)),
+    Case("body", "POST", "/echo", body=_echo_body(1)),
+    Case("large_table", "GET", "/some/1/and/2/99/:other"),
+    Case("large_body", "POST", "/echo", body=_echo_body(1_000)),
+)
+
+
+class Result(NamedTuple):
+    ns: float
+    peak_bytes: int
+    retained_blocks: float
+
+
+class _Headers(dict[str, str]):
+    def get_all(self, key: str) -> list[str]:
+        return [self[key]] if key in self else []
+
+
+class _Transport:
+    async def send_bytes(self, _content: bytes) -> None:
+        return
+
+    async def send_str(self, _content: str) -> None:
+        return
+
+
+class _RSGIProtocol:
+    """RSGI HTTP protocol with a fixed body discarding responses."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    async def __call__(self) -> bytes:
+        return self.body
+
+    def __aiter__(self) -> Any:
+        return self._chunks()
+
+    async def _chunks(self) -> Any:
+        yield self.body
+
+    def response_empty(self, **_kwargs: object) -> None:
+        return
+
+    def response_str(self, **_kwargs: object) -> None:
+        return
+
+    def response_bytes(self, **_kwargs: object) -> None:
+        return
+
+    def response_stream(self, **_kwargs: object) -> _Transport:
+        return _Transport()
+
+
+def _rsgi_call(case: Case) -> Callable[[], Awaitable[None]]:
+    scope = Scope(
+        proto="http",
+        rsgi_version="1.0",
+        http_version="1.1",
+        server="server",
+        client="client",
+        scheme="http",
+        method=case.method,
+        path=case.path,
+        query_string=case.query_string,
+        headers=_Headers(case.headers),
+    )
+    protocol = _RSGIProtocol(case.body)
+
+    def call() -> Awaitable[None]:
+        return app.__rsgi__(scope, protocol)  # type: ignore[arg-type]
+
+    return call
+
+
+def _asgi_call(case: Case) -> Callable[[], Awaitable[None]]:
+    scope: HTTPScope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": case.method,
+        "scheme": "http",
+        "path": case.path,
+        "raw_path": case.path.encode(),
+        "query_string": case.query_string.encode(),
+        "root_path": "",
+        "headers": [(k.encode(), v.encode()) for k, v in case.headers],
+        "client": None,
+        "server": None,
+        "extensions": {},
+    }
+    event: ASGIReceiveEvent = {
+        "type": "http.request",
+        "body": case.body,
+        "more_body": False,
+    }
+
+    async def receive() -> ASGIReceiveEvent:
+        return event
+
+    async def send(_event: ASGISendEvent) -> None:
+        return
+
+    def call() -> Awaitable[None]:
+        return app(scope, receive, send)  # type: ignore[arg-type]
+
+    return call
+
+
+INTERFACES = {"rsgi": _rsgi_call, "asgi": _asgi_call}
+
+
+async def _repeat(call: Callable[[], Awaitable[None]], count: int) -> None:
+    for _ in range(count):
+        await call()
+
+
+def _measure(
+    loop: asyncio.AbstractEventLoop, call: Callable[[], Awaitable[None]]
+) -> Result:
+    loop.run_until_complete(_repeat(call, 1_000))
+
+    rounds = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter_ns()
+        loop.run_until_complete(_repeat(call, REQUESTS))
+        rounds.append(time.perf_counter_ns() - start)
+    ns = min(rounds) / REQUESTS
+
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    current, _ = tracemalloc.get_traced_memory()
+    loop.run_until_complete(_repeat(call, MEMORY_REQUESTS))
+    _, peak = tracemalloc.get_traced_memory()
+    retained = (sys.getallocatedblocks() - blocks) / MEMORY_REQUESTS
+    tracemalloc.stop()
+    return Result(ns, peak - current, retained)
+
+
+def run() -> dict[str, Result]:
+    loop = asyncio.new_event_loop()
+    app.__rsgi_init__(loop)
+    try:
+        results = {
+            f"{interface}/{case.name}": _measure(loop, make_call(case))
+            for interface, make_call in INTERFACES.items()
+            for case in CASES
+        }
+        # Overhead of metrics, budgeted at 1 µs per request.
+        app.metrics = Metrics()
+        results |= {
+            f"rsgi+metrics/{case.name}": _measure(loop, _rsgi_call(case))
+            for case in CASES[:2]
+        }
+        return results
+    finally:
+        app.metrics = None
+        app.__rsgi_del__(loop)
+        loop.close()
+
+
+def _environment() -> dict[str, str]:
+    return {"python": sys.version.split()[0], "machine": platform.machine()}
+
+
+def save(results: dict[str, Result]) -> None:
+    data = {
+        "environment": _environment(),
+        "results": {name: result._asdict() for name, result in results.items()},
+    }
+    # Sorted like the `pretty-format-json` pre-commit hook writes it.
+    BASELINES_PATH.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def compare(results: dict[str, Result], tolerance: float) -> bool:
+    """Print results against baselines, returns False on regressions."""
+    data = json.loads(BASELINES_PATH.read_text())
+    if data["environment"] != _environment():
+        sys.stdout.write(f"baselines were stored on {data['environment']}\n")
+    ok = True
+    for name, result in results.items():
+        baseline = data["results"].get(name)
+        line = (
+            f"{name:<26}{result.ns:10.0f} ns{result.peak_bytes:10} B peak"
+            f"{result.retained_blocks:8.2f} blocks retained"
+        )
+        if baseline is not None:
+            change = result.ns / baseline["ns"] - 1
+            line += f"  {change:+7.1%}"
+            peak_limit = baseline["peak_bytes"] * (1 + tolerance)
+            if change > tolerance or result.peak_bytes > peak_limit:
+                line += "  REGRESSION"
+                ok = False
+        sys.stdout.write(line + "\n")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--save", action="store_true", help="store new baselines")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative growth, 0.25 by default",
+    )
+    args = parser.parse_args()
+
+    results = run()
+    if args.save or not BASELINES_PATH.exists():
+        save(results)
+        sys.stdout.write(f"baselines stored in {BASELINES_PATH}\n")
+    if not compare(results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
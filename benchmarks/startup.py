@@ -0,0 +1,121 @@
+"""
+Application startup benchmark.
+
+Registers 20k routes the way generated APIs do, one handler per route with
+a few distinct signatures, then starts the application. Reports time and
+memory traced by :py:mod:`tracemalloc` of route registration and startup::
+
+    python -m benchmarks.startup
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Annotated, Any
+
+from dependency_injector import containers, providers
+
+from pulya import Header, Pulya, Query, RequestContainer
+
+ROUTES = 20_000
+
+
+class Container(containers.DeclarativeContainer):
+    wiring_config = containers.WiringConfiguration(modules=[__name__])
+
+    request = providers.Container(RequestContainer)
+
+
+def _item_handler() -> Callable[..., Any]:
+    async def handler(item_id: int, fields: str = "all") -> dict[str, Any]:
+        return {"item_id": item_id, "fields": fields}
+
+    return handler
+
+
+def _search_handler() -> Callable[..., Any]:
+    async def handler(
+        q: str,
+        page: Annotated[int, Query("p")] = 1,
+        x_user: Annotated[str, Header("X-User", "anonymous")] = "",
+    ) -> list[str]:
+        return [q, str(page), x_user]
+
+    return handler
+
+
+def _static_handler() -> Callable[..., Any]:
+    def handler() -> str:
+        return "ok"
+
+    return handler
+
+
+HANDLERS = (
+    ("/items/{i}/{{item_id}}", _item_handler),
+    ("/search/{i}", _search_handler),
+    ("/static/{i}", _static_handler),
+)
+
+
+def _register(app: Pulya) -> None:
+    for i in range(ROUTES):
+        pattern, make_handler = HANDLERS[i % len(HANDLERS)]
+        app.get(pattern.format(i=i))(make_handler())
+
+
+def _seconds(action: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def _allocated_bytes(action: Callable[[], Any]) -> int:
+    """Memory allocated by the action and still in use after it."""
+    tracemalloc.start()
+    action()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def _report(name: str, seconds: float, memory: int) -> None:
+    sys.stdout.write(
+        f"{name:<14}{seconds * 1e3:9.1f} ms{memory / 2**20:9.1f} MiB"
+        f"{seconds / ROUTES * 1e6:9.1f} µs/route{memory / ROUTES:9.0f} B/route\n"
+    )
+
+
+def main() -> None:
+    # Tracing memory slows everything down, time is measured on another app.
+    timed, traced = Pulya(Container), Pulya(Container)
+    _report(
+        "registration",
+        _seconds(lambda: _register(timed)),
+        _allocated_bytes(lambda: _register(traced)),
+    )
+
+    loop = asyncio.new_event_loop()
+    try:
+        _report(
+            "startup",
+            _seconds(lambda: loop.run_until_complete(timed.on_startup())),
+            _allocated_bytes(lambda: loop.run_until_complete(traced.on_startup())),
+        )
+        loop.run_until_complete(timed.on_shutdown())
+        loop.run_until_complete(traced.on_shutdown())
+    finally:
+        loop.close()
+
+    structs = {route.path_params_schema for route in timed.routes}
+    structs |= {route.query_params_schema for route in timed.routes}
+    structs.discard(None)
+    sys.stdout.write(
+        f"{len(timed.routes)} routes share {len(structs)} params structs\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Thread scaling benchmark.
+
+Runs the example application in 1, 2, 4 and 8 threads, each with its own
+event loop the way granian thread workers do, and reports requests per
+second. Scaling is only expected on a free-threaded (3.13t/3.14t) build::
+
+    python -X gil=0 -m benchmarks.threads
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections.abc import Iterator
+
+from examples.simple_example import app
+from pulya.rsgi import Scope
+
+THREAD_COUNTS = (1, 2, 4, 8)
+REQUESTS_PER_THREAD = 20_000
+PATHS = ("/", "/str/", "/search/books?q=python")
+
+
+class _Headers(dict[str, str]):
+    def get_all(self, key: str) -> list[str]:
+        return [self[key]] if key in self else []
+
+
+class _Protocol:
+    """RSGI HTTP protocol discarding responses of the benchmarked routes."""
+
+    def response_bytes(self, **_kwargs: object) -> None:
+        return
+
+
+def _scopes() -> Iterator[Scope]:
+    while True:
+        for target in PATHS:
+            path, _, query_string = target.partition("?")
+            yield Scope(
+                proto="http",
+                rsgi_version="1.0",
+                http_version="1.1",
+                server="server",
+                client="client",
+                scheme="http",
+                method="GET",
+                path=path,
+                query_string=query_string,
+                headers=_Headers(),
+            )
+
+
+async def _serve(count: int) -> None:
+    protocol = _Protocol()
+    scopes = _scopes()
+    for _ in range(count):
+        await app.__rsgi__(next(scopes), protocol)  # type: ignore[arg-type]
+
+
+def _worker(started: threading.Barrier, finished: threading.Barrier) -> None:
+    loop = asyncio.new_event_loop()
+    app.__rsgi_init__(loop)
+    started.wait()
+    try:
+        loop.run_until_complete(_serve(REQUESTS_PER_THREAD))
+    except BaseException:
+        finished.abort()
+        raise
+    finished.wait()
+    app.__rsgi_del__(loop)
+    loop.close()
+
+
+def _measure(threads_count: int) -> float:
+    started = threading.Barrier(threads_count + 1)
+    finished = threading.Barrier(threads_count + 1)
+    threads = [
+        threading.Thread(target=_worker, args=(started, finished))
+        for _ in range(threads_count)
+    ]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    start = time.perf_counter()
+    finished.wait()
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return threads_count * REQUESTS_PER_THREAD / elapsed
+
+
+def main() -> None:
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    sys.stdout.write(f"python {sys.version.split()[0]}, GIL enabled: {gil_enabled}\n")
+    baseline = None
+    for threads_count in THREAD_COUNTS:
+        rps = _measure(threads_count)
+        baseline = baseline or rps
+        sys.stdout.write(
+            f"{threads_count:>2} threads {rps:>12,.0f} rps  x{rps / baseline:.2f}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
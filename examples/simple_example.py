@@ -1,16 +1,17 @@
 """Example app for performance testing."""
 
+from collections.abc import AsyncIterator
 from typing import Annotated, Any
 
 import msgspec.json
 from dependency_injector import containers, providers
 from dependency_injector.wiring import Provide, inject
 
-from pulya import Body, Header, Pulya
+from pulya import Body, Header, Pulya, Query, WebSocket
 from pulya.containers import RequestContainer
 from pulya.headers import Headers
 from pulya.request import Request
-from pulya.responses import Response
+from pulya.responses import Response, StreamingResponse
 
 
 class EchoBodyItem(msgspec.Struct):
@@ -23,6 +24,11 @@ class EchoBodyItem(msgspec.Struct):
     g: str
 
 
+class ChatMessage(msgspec.Struct):
+    room: str
+    text: str
+
+
 class EchoBody(msgspec.Struct):
     items: list[EchoBodyItem]
 
@@ -68,6 +74,21 @@ async def print_headers(
     return {"x-example": x_example}
 
 
+@app.get("/items/{item_id}")
+async def item(item_id: int) -> dict[str, int]:
+    return {"item_id": item_id}
+
+
+@app.get("/search/{category}")
+async def search(
+    category: str,
+    q: str,
+    page: Annotated[int, Query("p")] = 1,
+    tags: list[str] | None = None,
+) -> dict[str, Any]:
+    return {"category": category, "q": q, "page": page, "tags": tags}
+
+
 @app.get("/plain_response/")
 async def plain_response() -> Response:
     return Response(content=b"Hello in plain text!")
@@ -83,6 +104,16 @@ async def str_response() -> str:
     return "Hello in plain text!"
 
 
+async def _stream_chunks() -> AsyncIterator[bytes | str]:
+    yield "Hello "
+    yield b"in chunks!"
+
+
+@app.get("/stream/")
+async def stream_response() -> StreamingResponse:
+    return StreamingResponse(_stream_chunks())
+
+
 @app.post("/echo")
 @inject
 async def echo(
@@ -91,6 +122,13 @@ async def echo(
     return body
 
 
+@app.websocket("/ws/{room}")
+async def chat(websocket: WebSocket, room: str) -> None:
+    async for message in websocket:
+        text = message if isinstance(message, str) else message.decode()
+        await websocket.send_json(ChatMessage(room=room, text=text))
+
+
 for i in range(100):
     app.get(f"/some/{{id}}/and/{{another}}/{i}/:other")(index)
 
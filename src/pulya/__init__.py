@@ -1,7 +1,37 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .containers import RequestContainer
 from .headers import Headers
-from .params import Body, Header
+from .params import Body, Header, Query
 from .pulya import Pulya
-from .testing import TestClient
+from .routing import Router
+from .websocket import WebSocket
+
+if TYPE_CHECKING:
+    from .testing import TestClient
+
+__all__ = [
+    "Body",
+    "Header",
+    "Headers",
+    "Pulya",
+    "Query",
+    "RequestContainer",
+    "Router",
+    "TestClient",
+    "WebSocket",
+]
+
+#: Attributes imported on first access, so workers never load test tooling.
+_LAZY_ATTRIBUTES = {"TestClient": ".testing"}
+
 
-__all__ = ["Body", "Header", "Headers", "Pulya", "RequestContainer", "TestClient"]
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
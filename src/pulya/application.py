@@ -2,12 +2,18 @@ import abc
 from typing import Any
 
 from pulya.request import Request
+from pulya.websocket import WebSocket
 
 
 class AbstractApplication(abc.ABC):
+    #: Maximum accepted request body size in bytes, unlimited if None.
+    max_body_size: int | None = None
+
     @abc.abstractmethod
     async def handle_http_request(self, request: Request) -> Any: ...
     @abc.abstractmethod
+    async def handle_websocket(self, websocket: WebSocket) -> None: ...
+    @abc.abstractmethod
     async def on_startup(self) -> None: ...
     @abc.abstractmethod
     async def on_shutdown(self) -> None: ...
@@ -1,6 +1,6 @@
+import asyncio
 from abc import ABC
-from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
 from http import HTTPMethod, HTTPStatus
 
 import msgspec
@@ -8,20 +8,40 @@ from asgiref.typing import (
     ASGIReceiveCallable,
     ASGISendCallable,
     HTTPResponseBodyEvent,
+    HTTPResponsePathsendEvent,
     HTTPResponseStartEvent,
     HTTPScope,
     LifespanShutdownCompleteEvent,
     LifespanStartupCompleteEvent,
+    WebSocketAcceptEvent,
+    WebSocketCloseEvent,
+    WebSocketScope,
+    WebSocketSendEvent,
 )
 from asgiref.typing import Scope as ASGIScope
 
 from pulya.application import AbstractApplication
 from pulya.headers import Headers
-from pulya.request import Request
-from pulya.responses import Response
+from pulya.request import BaseRequest, check_content_length, limit_body
+from pulya.responses import (
+    JSON_HEADERS,
+    MSGPACK_HEADERS,
+    TEXT_HEADERS,
+    FileResponse,
+    Response,
+    StreamingResponse,
+    render_response,
+    wants_msgpack,
+)
+from pulya.serialization import encode_json, encode_msgpack
+from pulya.tracing import HANDLER, SEND, SERIALIZE
+from pulya.websocket import WebSocket, WebSocketDisconnectError
+
+#: Size of chunks used to send files when the server has no pathsend support.
+FILE_CHUNK_SIZE = 64 * 1024
 
 
-class ASGIRequest(Request):
+class ASGIRequest(BaseRequest):
     """
     ASGI request adapter.
 
@@ -30,7 +50,13 @@ class ASGIRequest(Request):
 
     __slots__ = ("_receive", "_scope")
 
-    def __init__(self, scope: HTTPScope, receive: ASGIReceiveCallable) -> None:
+    def __init__(
+        self,
+        scope: HTTPScope,
+        receive: ASGIReceiveCallable,
+        max_body_size: int | None = None,
+    ) -> None:
+        super().__init__(max_body_size)
         self._scope = scope
         self._receive = receive
 
@@ -45,37 +71,218 @@ class ASGIRequest(Request):
         return self._scope["path"]
 
     @property
-    def headers(self) -> Headers:
-        """HTTP headers."""
+    def query_string(self) -> str:
+        """Raw query string."""
+        return self._scope["query_string"].decode("latin-1")
+
+    def _make_headers(self) -> Headers:
         return ASGIHeaders(self._scope["headers"])
 
-    async def get_content(self) -> bytes:
-        """Read and return the whole request body."""
-        body = b""
+    async def _read_content(self) -> bytes:
+        return b"".join([chunk async for chunk in self.stream()])
+
+    def stream(self) -> AsyncIterator[bytes]:
+        """Iterate over request body chunks as they are received."""
+        if self._max_body_size is None:
+            return self._receive_body()
+        check_content_length(self.headers, self._max_body_size)
+        return limit_body(self._receive_body(), self._max_body_size)
+
+    async def _receive_body(self) -> AsyncIterator[bytes]:
         more_body = True
         while more_body:
             message = await self._receive()
             if message["type"] == "http.request":
-                body += message.get("body", b"")
+                if chunk := message.get("body", b""):
+                    yield chunk
                 more_body = message.get("more_body", False)
             else:  # pragma: no cover
                 msg = f"Unsupported ASGI message type {message['type']}"
                 raise RuntimeError(msg)
-        return body
+
+
+class ASGIWebSocket(WebSocket):
+    """ASGI websocket adapter."""
+
+    __slots__ = ("_receive", "_scope", "_send")
+
+    def __init__(
+        self,
+        scope: WebSocketScope,
+        receive: ASGIReceiveCallable,
+        send: ASGISendCallable,
+    ) -> None:
+        super().__init__()
+        self._scope = scope
+        self._receive = receive
+        self._send = send
+
+    @property
+    def path(self) -> str:
+        """Request path."""
+        return self._scope["path"]
+
+    @property
+    def query_string(self) -> str:
+        """Raw query string."""
+        return self._scope["query_string"].decode("latin-1")
+
+    def _make_headers(self) -> Headers:
+        return ASGIHeaders(self._scope["headers"])
+
+    async def _accept(self) -> None:
+        message = await self._receive()
+        if message["type"] != "websocket.connect":  # pragma: no cover
+            msg = f"Unexpected ASGI message type {message['type']}"
+            raise RuntimeError(msg)
+        await self._send(
+            WebSocketAcceptEvent(type="websocket.accept", subprotocol=None, headers=[])
+        )
+
+    async def _receive_message(self) -> bytes | str:
+        message = await self._receive()
+        if message["type"] == "websocket.receive":
+            text = message.get("text")
+            return text if text is not None else message.get("bytes") or b""
+        if message["type"] == "websocket.disconnect":
+            self._closed = True
+            raise WebSocketDisconnectError(message["code"])
+        msg = f"Unexpected ASGI message type {message['type']}"  # pragma: no cover
+        raise RuntimeError(msg)  # pragma: no cover
+
+    async def _send_bytes(self, data: bytes) -> None:
+        await self._send(
+            WebSocketSendEvent(type="websocket.send", bytes=data, text=None)
+        )
+
+    async def _send_str(self, data: str) -> None:
+        await self._send(
+            WebSocketSendEvent(type="websocket.send", bytes=None, text=data)
+        )
+
+    async def _close(self, code: int) -> None:
+        await self._send(
+            WebSocketCloseEvent(type="websocket.close", code=code, reason=None)
+        )
 
 
 class ASGIHeaders(Headers):
     """
     ASGI headers adapter.
 
-    Adopts headers structure defined in ASGI scope to internal one.
+    Lazily decodes header pairs from ASGI scope, names there are lower-cased.
     """
 
+    __slots__ = ["_raw"]
+
     def __init__(self, headers: Iterable[tuple[bytes, bytes]] | None = None) -> None:
-        self._headers = defaultdict(list)
-        if headers:
-            for k, v in headers:
-                self.add(k.decode(), v.decode())
+        self._headers = {}
+        self._loaded = False
+        self._raw = headers or ()
+
+    def _load(self, key: str) -> list[str]:
+        name = key.encode()
+        return [v.decode() for k, v in self._raw if k == name]
+
+    def _native_items(self) -> Iterable[tuple[str, str]]:
+        return ((k.decode(), v.decode()) for k, v in self._raw)
+
+
+async def _send_body(
+    send: ASGISendCallable,
+    status: int,
+    headers: Iterable[tuple[bytes, bytes]],
+    body: bytes,
+) -> None:
+    await send(
+        HTTPResponseStartEvent(
+            type="http.response.start",
+            status=status,
+            headers=headers,
+            trailers=False,
+        )
+    )
+    await send(
+        HTTPResponseBodyEvent(type="http.response.body", body=body, more_body=False)
+    )
+
+
+async def _send_stream(response: StreamingResponse, send: ASGISendCallable) -> None:
+    """Send each chunk as a separate body event with `more_body` set."""
+    await send(
+        HTTPResponseStartEvent(
+            type="http.response.start",
+            status=response.status,
+            headers=[(k.encode(), v.encode()) for k, v in response.headers],
+            trailers=False,
+        )
+    )
+    async for chunk in response.content:
+        await send(
+            HTTPResponseBodyEvent(
+                type="http.response.body",
+                body=chunk.encode() if isinstance(chunk, str) else chunk,
+                more_body=True,
+            )
+        )
+    await send(
+        HTTPResponseBodyEvent(
+            type="http.response.body",
+            body=b"",
+            more_body=False,
+        )
+    )
+
+
+async def _send_file(
+    response: FileResponse, scope: HTTPScope, send: ASGISendCallable
+) -> None:
+    """
+    Send file using `http.response.pathsend` extension when available.
+
+    Falls back to reading the file in chunks in a thread.
+    """
+    await send(
+        HTTPResponseStartEvent(
+            type="http.response.start",
+            status=response.status,
+            headers=[(k.encode(), v.encode()) for k, v in response.headers],
+            trailers=False,
+        )
+    )
+    if scope["method"] == HTTPMethod.HEAD:
+        await send(
+            HTTPResponseBodyEvent(type="http.response.body", body=b"", more_body=False)
+        )
+        return
+    extensions = scope.get("extensions") or {}
+    if response.byte_range is None and "http.response.pathsend" in extensions:
+        # asgiref send callable typing misses the pathsend extension event.
+        await send(
+            HTTPResponsePathsendEvent(  # type: ignore[arg-type]
+                type="http.response.pathsend", path=response.path
+            )
+        )
+        return
+
+    start, end = response.byte_range or (0, None)
+    with open(response.path, "rb") as file:  # noqa: PTH123, ASYNC230
+        file.seek(start)
+        remaining = end - start if end is not None else None
+        while True:
+            size = FILE_CHUNK_SIZE
+            if remaining is not None:
+                size = min(size, remaining)
+                remaining -= size
+            chunk = await asyncio.to_thread(file.read, size)
+            more_body = len(chunk) == size and remaining != 0
+            await send(
+                HTTPResponseBodyEvent(
+                    type="http.response.body", body=chunk, more_body=more_body
+                )
+            )
+            if not more_body:
+                return
 
 
 class ASGIApplication(AbstractApplication, ABC):
@@ -85,97 +292,79 @@ class ASGIApplication(AbstractApplication, ABC):
         self, scope: ASGIScope, receive: ASGIReceiveCallable, send: ASGISendCallable
     ) -> None:
         if scope["type"] == "lifespan":
-            while True:
-                message = await receive()
-                if message["type"] == "lifespan.startup":
-                    await self.on_startup()
-                    await send(
-                        LifespanStartupCompleteEvent(type="lifespan.startup.complete")
-                    )
-                if message["type"] == "lifespan.shutdown":
-                    await self.on_shutdown()
-                    await send(
-                        LifespanShutdownCompleteEvent(type="lifespan.shutdown.complete")
-                    )
-                    return
+            await self._handle_lifespan(receive, send)
+        elif scope["type"] == "websocket":
+            await self.handle_websocket(ASGIWebSocket(scope, receive, send))
         elif scope["type"] == "http":
-            response = await self.handle_http_request(ASGIRequest(scope, receive))
+            await self._handle_asgi_http(scope, receive, send)
+        else:  # pragma: no cover
+            msg = f"Unsupported scope type {type(scope['type'])}"
+            raise RuntimeError(msg)
 
-            if isinstance(response, Response):
-                await send(
-                    HTTPResponseStartEvent(
-                        type="http.response.start",
-                        status=response.status,
-                        headers=[
-                            (b"content-type", b"text/plain"),
-                        ],
-                        trailers=False,
-                    )
-                )
-                await send(
-                    HTTPResponseBodyEvent(
-                        type="http.response.body",
-                        body=response.content,
-                        more_body=False,
-                    )
-                )
-            elif isinstance(response, str):
-                await send(
-                    HTTPResponseStartEvent(
-                        type="http.response.start",
-                        status=HTTPStatus.OK,  # TODO @roman: get default status
-                        headers=[
-                            (b"content-type", b"text/plain"),
-                        ],
-                        trailers=False,
-                    )
-                )
-                await send(
-                    HTTPResponseBodyEvent(
-                        type="http.response.body",
-                        body=response.encode(),
-                        more_body=False,
-                    )
+    async def _handle_asgi_http(
+        self, scope: HTTPScope, receive: ASGIReceiveCallable, send: ASGISendCallable
+    ) -> None:
+        request = ASGIRequest(scope, receive, self.max_body_size)
+        response = await self.handle_http_request(request)
+        route = request.route
+        content_headers = None if route is None else route.content_headers
+        trace = request.trace
+        if trace is not None:
+            trace.mark(HANDLER)
+            response = render_response(
+                response, content_headers, msgpack=wants_msgpack(request)
+            )
+            trace.mark(SERIALIZE)
+        if isinstance(response, Response):
+            headers = [(k.encode(), v.encode()) for k, v in response.headers]
+            if not any(k == b"content-type" for k, _ in headers):
+                headers.append(
+                    (b"content-type", response.default_content_type.encode())
                 )
-            elif isinstance(response, bytes):
-                await send(
-                    HTTPResponseStartEvent(
-                        type="http.response.start",
-                        status=HTTPStatus.OK,  # TODO @roman: get default status
-                        headers=[
-                            (b"content-type", b"text/plain"),
-                        ],
-                        trailers=False,
-                    )
+            await _send_body(send, response.status, headers, response.content)
+        elif isinstance(response, StreamingResponse):
+            await _send_stream(response, send)
+        elif isinstance(response, FileResponse):
+            await _send_file(response, scope, send)
+        elif isinstance(response, str | bytes):
+            await _send_body(
+                send,
+                HTTPStatus.OK,
+                (content_headers or TEXT_HEADERS).asgi,
+                response.encode() if isinstance(response, str) else response,
+            )
+        elif isinstance(response, (msgspec.Struct, dict, list, int)):
+            if wants_msgpack(request):
+                await _send_body(
+                    send, HTTPStatus.OK, MSGPACK_HEADERS.asgi, encode_msgpack(response)
                 )
-                await send(
-                    HTTPResponseBodyEvent(
-                        type="http.response.body",
-                        body=response,
-                        more_body=False,
-                    )
+            else:
+                await _send_body(
+                    send,
+                    HTTPStatus.OK,
+                    (content_headers or JSON_HEADERS).asgi,
+                    encode_json(response),
                 )
-            elif isinstance(response, (msgspec.Struct, dict, list, str, int | bytes)):
+        else:  # pragma: no cover
+            msg = f"Unsupported response type {type(response)}"
+            raise TypeError(msg)
+        if trace is not None:
+            trace.mark(SEND)
+            trace.finish()
+
+    async def _handle_lifespan(
+        self, receive: ASGIReceiveCallable, send: ASGISendCallable
+    ) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.on_startup()
                 await send(
-                    HTTPResponseStartEvent(
-                        type="http.response.start",
-                        status=HTTPStatus.OK,  # TODO @roman: get default status
-                        headers=[
-                            (b"content-type", b"text/plain"),
-                        ],
-                        trailers=False,
-                    )
+                    LifespanStartupCompleteEvent(type="lifespan.startup.complete")
                 )
+            if message["type"] == "lifespan.shutdown":
+                await self.on_shutdown()
                 await send(
-                    HTTPResponseBodyEvent(
-                        type="http.response.body",
-                        body=msgspec.json.encode(response),
-                        more_body=False,
-                    )
+                    LifespanShutdownCompleteEvent(type="lifespan.shutdown.complete")
                 )
-            else:  # pragma: no cover
-                msg = f"Unsupported response type {type(response)}"
-                raise RuntimeError(msg)
-        else:  # pragma: no cover
-            msg = f"Unsupported scope type {type(scope['type'])}"
-            raise RuntimeError(msg)
+                return
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl
+
+from pulya.request import Request
+from pulya.responses import Response, render_response, wants_msgpack
+
+if TYPE_CHECKING:
+    from pulya.routing import Invoker, Route
+
+#: Default byte budget of cached responses.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+#: Cached response: content, status and headers, never mutated.
+_Entry = tuple[bytes, HTTPStatus, tuple[tuple[str, str], ...]]
+
+
+class CacheStore:
+    """
+    In-process LRU of encoded responses.
+
+    Entries expire after their TTL and the least recently used ones are
+    evicted once the total size of cached bodies and headers exceeds
+    `max_bytes`. Responses are copied in and out, so middleware modifying
+    a served response never changes the cached one.
+    """
+
+    __slots__ = ("_clock", "_entries", "_lock", "max_bytes", "size")
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        #: Current total size of cached entries.
+        self.size = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, _Entry, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Response | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, (content, status, headers), size = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.size -= size
+                return None
+            self._entries.move_to_end(key)
+        return Response(content, status, list(headers))
+
+    def set(self, key: Hashable, response: Response, ttl: float) -> None:
+        headers = tuple(response.headers)
+        size = len(response.content) + sum(len(k) + len(v) for k, v in headers)
+        if size > self.max_bytes:
+            return
+        cached = (response.content, response.status, headers)
+        with self._lock:
+            if (old := self._entries.pop(key, None)) is not None:
+                self.size -= old[2]
+            self._entries[key] = (self._clock() + ttl, cached, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def invalidate(
+        self, route: "Route | None" = None, params: Mapping[str, str] | None = None
+    ) -> int:
+        """
+        Drop cached responses of the route, all of them if route is None.
+
+        `params` limits invalidation to responses of matching path params.
+        Returns number of dropped entries.
+        """
+        expected = set(params.items()) if params else set()
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if route is None or (key[0] is route and expected.issubset(key[1]))  # type: ignore[index]
+            ]
+            for key in keys:
+                self.size -= self._entries.pop(key)[2]
+        return len(keys)
+
+
+class Cache:
+    """
+    Response caching of a GET or HEAD route.
+
+    Successful responses are cached for `ttl` seconds by path params and
+    values of the selected `query` params and `headers`. Cached responses
+    are served without resolving dependencies and calling the handler.
+
+    Middleware, including :py:class:`~pulya.compression.Compression`, runs
+    outside of the cache: responses are cached uncompressed and every hit
+    is compressed again.
+    """
+
+    __slots__ = ("headers", "query", "ttl")
+
+    def __init__(
+        self, ttl: float, *, query: Iterable[str] = (), headers: Iterable[str] = ()
+    ) -> None:
+        self.ttl = ttl
+        self.query = tuple(query)
+        self.headers = tuple(h.lower() for h in headers)
+
+    def wrap(self, route: "Route", invoke: "Invoker", store: CacheStore) -> "Invoker":
+        """Serve route responses from the store when possible."""
+        query = self.query
+        headers = self.headers
+        ttl = self.ttl
+
+        async def invoke_cached(request: Request, params: Mapping[str, str]) -> Any:
+            msgpack = wants_msgpack(request)
+            key: tuple[Any, ...] = (route, frozenset(params.items()), msgpack)
+            if query:
+                values = dict(parse_qsl(request.query_string))
+                key += tuple(values.get(name) for name in query)
+            if headers:
+                key += tuple(request.headers.get_first(name) for name in headers)
+
+            cached = store.get(key)
+            if cached is not None:
+                return cached
+            response = render_response(
+                await invoke(request, params), route.content_headers, msgpack=msgpack
+            )
+            if isinstance(response, Response) and response.status == HTTPStatus.OK:
+                store.set(key, response, ttl)
+            return response
+
+        return invoke_cached
@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import importlib
+import zlib
+from collections.abc import Callable, Iterable
+from types import ModuleType
+from typing import Any
+
+from pulya.middleware import CallNext
+from pulya.request import Request
+from pulya.responses import Response, render_response, wants_msgpack
+from pulya.staticfiles import accepted_encodings
+
+
+def _optional_module(name: str) -> ModuleType | None:
+    try:
+        return importlib.import_module(name)
+    except ImportError:  # pragma: no cover
+        return None
+
+
+brotli = _optional_module("brotli")
+zstandard = _optional_module("zstandard")
+
+#: Compression function taking body and level, None for the codec default.
+Codec = Callable[[bytes, int | None], bytes]
+
+
+def _gzip(data: bytes, level: int | None) -> bytes:
+    return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+
+
+def _deflate(data: bytes, level: int | None) -> bytes:
+    return zlib.compress(data, -1 if level is None else level)
+
+
+def _brotli(data: bytes, level: int | None) -> bytes:  # pragma: no cover
+    result: bytes = brotli.compress(data, quality=11 if level is None else level)  # type: ignore[union-attr]
+    return result
+
+
+def _zstd(data: bytes, level: int | None) -> bytes:  # pragma: no cover
+    compressor = zstandard.ZstdCompressor(level=3 if level is None else level)  # type: ignore[union-attr]
+    result: bytes = compressor.compress(data)
+    return result
+
+
+#: Codecs by content-encoding in server preference order.
+CODECS: dict[str, Codec] = {}
+if zstandard is not None:  # pragma: no cover
+    CODECS["zstd"] = _zstd
+if brotli is not None:  # pragma: no cover
+    CODECS["br"] = _brotli
+CODECS["gzip"] = _gzip
+CODECS["deflate"] = _deflate
+
+
+class Compression:
+    """
+    Middleware compressing response bodies.
+
+    Bodies smaller than `minimum_size` are sent as is, bodies of at least
+    `offload_size` bytes are compressed in a thread, so the event loop keeps
+    serving other requests. Routes opt out with `skip_middleware`.
+    `zstd` and `br` are offered only when the optional `zstandard` and
+    `brotli` packages are installed.
+    """
+
+    __slots__ = ("codecs", "level", "minimum_size", "offload_size")
+
+    def __init__(
+        self,
+        *,
+        minimum_size: int = 500,
+        offload_size: int = 256 * 1024,
+        level: int | None = None,
+        encodings: Iterable[str] | None = None,
+    ) -> None:
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        #: Level passed to the codec, None for the codec default.
+        self.level = level
+        self.codecs = (
+            dict(CODECS)
+            if encodings is None
+            else {e: CODECS[e] for e in encodings if e in CODECS}
+        )
+
+    async def __call__(self, request: Request, call_next: CallNext) -> Any:
+        result = await call_next(request)
+        accept_encoding = request.headers.get_first("accept-encoding")
+        if not accept_encoding:
+            return result
+        route = request.route
+        response = render_response(
+            result,
+            None if route is None else route.content_headers,
+            msgpack=wants_msgpack(request),
+        )
+        if not isinstance(response, Response) or len(response.content) < (
+            self.minimum_size
+        ):
+            return response
+        if any(k.lower() == "content-encoding" for k, _ in response.headers):
+            return response
+
+        accepted = accepted_encodings(accept_encoding)
+        encoding = next((e for e in self.codecs if e in accepted), None)
+        if encoding is None:
+            return response
+        codec = self.codecs[encoding]
+        if len(response.content) >= self.offload_size:
+            content = await asyncio.to_thread(codec, response.content, self.level)
+        else:
+            content = codec(response.content, self.level)
+
+        headers = [(k, v) for k, v in response.headers if k.lower() != "content-length"]
+        if not any(k.lower() == "content-type" for k, _ in headers):
+            headers.append(("content-type", response.default_content_type))
+        headers += [("content-encoding", encoding), ("vary", "accept-encoding")]
+        return Response(content, status=response.status, headers=headers)
@@ -1,5 +1,5 @@
 from contextvars import ContextVar
-from typing import TypeVar
+from typing import TypeVar, cast
 
 import msgspec
 from dependency_injector.containers import DeclarativeContainer
@@ -9,18 +9,45 @@ from dependency_injector.providers import (
     Provider,
 )
 
-from pulya.request import Request
+from pulya.request import Request, RequestValidationError
+from pulya.serialization import Decoders, get_decoders, is_msgpack
 
 T = TypeVar("T")
 
+_MSGPACK_NIL = b"\xc0"
+
+
+async def read_body[B](request: Request, decoders: Decoders[B]) -> B:
+    """
+    Decode request body as `schema`.
+
+    MessagePack bodies are decoded according to `Content-Type`, anything
+    else is decoded as JSON. Decoded values are kept in the request cache,
+    so any number of dependencies consuming the body cost one read and one
+    decode per type. Invalid bodies raise :py:class:`RequestValidationError`.
+    """
+    cache = request.cache
+    key = (read_body, decoders.schema)
+    if key not in cache:
+        content = await request.get_content()
+        try:
+            if is_msgpack(request.headers.get_first("content-type")):
+                cache[key] = decoders.msgpack.decode(content or _MSGPACK_NIL)
+            else:
+                cache[key] = decoders.json.decode(content or b"null")
+        except msgspec.DecodeError as e:
+            raise RequestValidationError(str(e), "body") from None
+    return cast("B", cache[key])
+
 
 class _BodyWrapper:
-    def __init__(self, content: bytes) -> None:
-        self.content = content
+    """Request body decoder."""
+
+    def __init__(self, request: Request) -> None:
+        self.request = request
 
-    def deserialize(self, body_arg_schema: type[T]) -> T:
-        content = self.content or b"null"
-        return msgspec.json.decode(content, type=body_arg_schema)
+    async def deserialize(self, body_arg_schema: type[T]) -> T:
+        return await read_body(self.request, get_decoders(body_arg_schema))
 
 
 class RequestContainer(DeclarativeContainer):
@@ -28,4 +55,4 @@ class RequestContainer(DeclarativeContainer):
     request: Provider[Request] = Factory(ctx.provided.get.call())
 
     headers = Factory(request.provided.headers)
-    body = Factory(_BodyWrapper, request.provided.get_content.call())
+    body = Factory(_BodyWrapper, request)
@@ -0,0 +1,60 @@
+import os
+import threading
+from asyncio import get_running_loop
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Any
+
+
+class HandlerExecutor:
+    """
+    Bounded thread pool running sync route handlers.
+
+    Handlers run in a copy of the caller context, so the active request
+    is visible to dependency-injector providers in the worker thread.
+    :py:attr:`saturation` tells how loaded the pool is.
+    """
+
+    __slots__ = ("_executor", "_lock", "max_workers", "pending")
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        if max_workers is None:
+            # Default size of ThreadPoolExecutor.
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.max_workers = max_workers
+        self._executor = self._create_executor()
+        #: Number of submitted calls which are not finished yet.
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    def _create_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pulya-handler"
+        )
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        """
+        Stop worker threads once their calls finish.
+
+        The pool stays usable: threads are started again by the next call,
+        so a restarted application keeps working.
+        """
+        executor, self._executor = self._executor, self._create_executor()
+        executor.shutdown(wait=wait)
+
+    @property
+    def saturation(self) -> float:
+        """Pending calls per worker, values above 1 mean calls wait in queue."""
+        return self.pending / self.max_workers
+
+    async def run(self, func: Callable[..., Any], /, **kwargs: Any) -> Any:
+        call = partial(copy_context().run, func, **kwargs)
+        with self._lock:
+            self.pending += 1
+        try:
+            return await get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            with self._lock:
+                self.pending -= 1
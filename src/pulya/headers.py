@@ -1,6 +1,5 @@
 import logging
-from collections import defaultdict
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -23,20 +22,49 @@ class Headers:
 
     An interface for accessing request headers, abstracted from the implementation
     details of a particular protocol.
+
+    Protocol adapters load values from the server's native structure lazily:
+    only looked up names are decoded, the rest is loaded on iteration.
     """
 
-    __slots__ = ["_headers"]
+    __slots__ = ["_headers", "_loaded"]
 
-    _headers: defaultdict[str, list[str]]
+    #: Values of names already looked up (or changed), by lower-cased name.
+    _headers: dict[str, list[str]]
+    #: Whether all names are loaded into `_headers` from the native structure.
+    _loaded: bool
 
     def __getitem__(self, item: str) -> str | None:
         return self.get(item)
 
     def __iter__(self) -> Iterator[tuple[str, str]]:
+        if not self._loaded:
+            self._load_all()
         for k in self._headers:
             for v in self._headers[k]:
                 yield k, v
 
+    def _load(self, key: str) -> list[str]:
+        """Load values of lower-cased `key` from the native structure."""
+        raise NotImplementedError
+
+    def _native_items(self) -> Iterable[tuple[str, str]]:
+        """Iterate over all name-value pairs of the native structure."""
+        raise NotImplementedError
+
+    def _load_all(self) -> None:
+        """Load all names keeping the native order, known values win."""
+        headers: dict[str, list[str]] = {}
+        for k, v in self._native_items():
+            if k in self._headers:
+                headers[k] = self._headers[k]
+            else:
+                headers.setdefault(k, []).append(v)
+        for k, values in self._headers.items():
+            headers.setdefault(k, values)
+        self._headers = headers
+        self._loaded = True
+
     def get(
         self,
         key: str,
@@ -82,13 +110,18 @@ class Headers:
         return self.get(key, default, ManyStrategy.last)
 
     def add(self, key: str, value: str) -> None:
-        self._headers[key.lower()].append(value)
+        self.get_list(key).append(value)
 
     def set(self, key: str, value: str) -> None:
         self._headers[key.lower()] = [value]
 
     def get_list(self, key: str) -> list[str]:
-        return self._headers.get(key.lower(), [])
+        key = key.lower()
+        values = self._headers.get(key)
+        if values is None:
+            values = [] if self._loaded else self._load(key)
+            self._headers[key] = values
+        return values
 
     def set_list(self, key: str, values: list[str]) -> None:
         self._headers[key.lower()] = values
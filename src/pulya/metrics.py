@@ -0,0 +1,165 @@
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable
+from http import HTTPStatus
+from typing import Any
+
+from pulya.request import Request
+from pulya.responses import BaseResponse, Response
+
+#: Upper bounds of latency histogram buckets in seconds.
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+#: Route label of requests not matching any route.
+UNMATCHED = "<unmatched>"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _RouteStats:
+    """Counters of a single route written by a single thread."""
+
+    __slots__ = ("buckets", "count", "in_flight", "statuses", "total")
+
+    def __init__(self, buckets_count: int) -> None:
+        self.statuses: dict[int, int] = {}
+        #: Non-cumulative counts, the last one is `+Inf` bucket.
+        self.buckets = [0] * (buckets_count + 1)
+        self.count = 0
+        self.total = 0.0
+        self.in_flight = 0
+
+
+class Metrics:
+    """
+    Per-route request counters, latency histograms and in-flight gauges.
+
+    Routes are labeled by their url pattern, so the number of series stays
+    bounded. Every thread writes its own counters without locking, they are
+    summed up only when rendered. `gauges` are extra values rendered as is.
+    """
+
+    __slots__ = ("_local", "_lock", "_shards", "buckets", "gauges")
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.gauges: dict[str, Callable[[], float]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[dict[str, _RouteStats]] = []
+
+    def _shard(self) -> dict[str, _RouteStats]:
+        try:
+            return self._local.shard  # type: ignore[no-any-return]
+        except AttributeError:
+            shard: dict[str, _RouteStats] = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    async def measure(self, route: str, call: Awaitable[Any]) -> Any:
+        """Await route call recording its status and latency."""
+        shard = self._shard()
+        stats = shard.get(route)
+        if stats is None:
+            stats = shard[route] = _RouteStats(len(self.buckets))
+        stats.in_flight += 1
+        start = time.perf_counter()
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+        try:
+            result = await call
+            status = (
+                result.status if isinstance(result, BaseResponse) else HTTPStatus.OK
+            )
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.in_flight -= 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.buckets[bisect_left(self.buckets, elapsed)] += 1
+            stats.count += 1
+            stats.total += elapsed
+
+    def _collect(self) -> dict[str, _RouteStats]:
+        with self._lock:
+            shards = list(self._shards)
+        merged: dict[str, _RouteStats] = {}
+        for shard in shards:
+            for route, stats in list(shard.items()):
+                total = merged.get(route)
+                if total is None:
+                    total = merged[route] = _RouteStats(len(self.buckets))
+                for status, count in list(stats.statuses.items()):
+                    total.statuses[status] = total.statuses.get(status, 0) + count
+                for i, count in enumerate(stats.buckets):
+                    total.buckets[i] += count
+                total.count += stats.count
+                total.total += stats.total
+                total.in_flight += stats.in_flight
+        return merged
+
+    def render(self) -> str:
+        """Render metrics in Prometheus text exposition format."""
+        routes = sorted(self._collect().items())
+        lines = [
+            "# HELP pulya_requests_total Number of handled requests.",
+            "# TYPE pulya_requests_total counter",
+        ]
+        for route, stats in routes:
+            lines += [
+                f'pulya_requests_total{{route="{route}",status="{status}"}} {count}'
+                for status, count in sorted(stats.statuses.items())
+            ]
+        lines += [
+            "# HELP pulya_request_duration_seconds Request handling latency.",
+            "# TYPE pulya_request_duration_seconds histogram",
+        ]
+        bounds = [*map(str, self.buckets), "+Inf"]
+        for route, stats in routes:
+            label = f'route="{route}"'
+            cumulative = 0
+            for bound, count in zip(bounds, stats.buckets, strict=True):
+                cumulative += count
+                lines.append(
+                    "pulya_request_duration_seconds_bucket"
+                    f'{{{label},le="{bound}"}} {cumulative}'
+                )
+            lines += [
+                f"pulya_request_duration_seconds_sum{{{label}}} {stats.total}",
+                f"pulya_request_duration_seconds_count{{{label}}} {stats.count}",
+            ]
+        lines += [
+            "# HELP pulya_requests_in_flight Number of requests being handled.",
+            "# TYPE pulya_requests_in_flight gauge",
+        ]
+        lines += [
+            f'pulya_requests_in_flight{{route="{route}"}} {stats.in_flight}'
+            for route, stats in routes
+        ]
+        for name, value in sorted(self.gauges.items()):
+            lines += [f"# TYPE {name} gauge", f"{name} {value()}"]
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, _request: Request) -> Response:
+        """Route handler exposing metrics to Prometheus."""
+        return Response(
+            content=self.render().encode(),
+            headers=[("content-type", CONTENT_TYPE)],
+        )
@@ -0,0 +1,30 @@
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from pulya.request import Request
+
+#: Call of the rest of the middleware stack and the route handler.
+CallNext = Callable[[Request], Awaitable[Any]]
+
+#: Middleware, takes request and the call of the next middleware or handler.
+Middleware = Callable[[Request, CallNext], Awaitable[Any]]
+
+
+def _bind(middleware: Middleware, call_next: CallNext) -> CallNext:
+    def call(request: Request) -> Awaitable[Any]:
+        return middleware(request, call_next)
+
+    return call
+
+
+def compose(middleware: Iterable[Middleware], handler: CallNext) -> CallNext:
+    """
+    Nest middleware around the handler, the first one being the outermost.
+
+    The stack is composed once, so calling it costs one call per middleware
+    and nothing per request.
+    """
+    call = handler
+    for item in reversed(list(middleware)):
+        call = _bind(item, call)
+    return call
@@ -1,14 +1,84 @@
+from collections.abc import Awaitable
 from types import UnionType
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from dependency_injector.wiring import Provide
+from msgspec import NODEFAULT
 
-from pulya.containers import RequestContainer
+from pulya.containers import RequestContainer, read_body
+from pulya.request import Request
+from pulya.serialization import get_decoders
+
+if TYPE_CHECKING:
+    # dependency-injector declares markers as protocol instances for type checkers.
+    class _Provide:
+        def __init__(self, provider: Any) -> None: ...
+
+else:
+    _Provide = Provide
+
+
+class NativeMarker(_Provide):
+    """
+    Marker of a parameter pulya resolves from the request by itself.
+
+    Routes call `resolve` directly instead of going through
+    dependency-injector, which is still able to resolve the marker
+    when the handler is called outside of pulya.
+    """
+
+    #: Whether `resolve` returns an awaitable.
+    is_async = False
+
+    def resolve(self, request: Request) -> Any:
+        raise NotImplementedError
+
+
+class BodyMarker(NativeMarker):
+    is_async = True
+
+    def __init__(self, schema: Any) -> None:
+        super().__init__(RequestContainer.body.provided.deserialize.call(schema))
+        self.schema = schema
+        self.decoders = get_decoders(schema)
+
+    def resolve(self, request: Request) -> Awaitable[Any]:
+        return read_body(request, self.decoders)
+
+
+class HeaderMarker(NativeMarker):
+    def __init__(self, name: str, default: str | None = None) -> None:
+        super().__init__(RequestContainer.headers.provided.get.call(name, default))
+        self.name = name
+        self.default = default
+
+    def resolve(self, request: Request) -> str | None:
+        return request.headers.get(self.name, self.default)
+
+
+class QueryMarker:
+    """
+    Marker of a query string parameter.
+
+    Query params of a route are converted together into a msgspec struct
+    built when the route is registered.
+    """
+
+    __slots__ = ("default", "name")
+
+    def __init__(self, name: str | None = None, default: Any = NODEFAULT) -> None:
+        self.name = name
+        self.default = default
 
 
 def Body(_type: type | UnionType) -> Any:  # noqa: N802
-    return Provide[RequestContainer.body.provided.deserialize.call(_type)]
+    return BodyMarker(_type)
 
 
 def Header(name: str, default: None = None) -> Any:  # noqa: N802
-    return Provide[RequestContainer.headers.provided.get.call(name, default)]
+    return HeaderMarker(name, default)
+
+
+def Query(name: str | None = None, default: Any = NODEFAULT) -> Any:  # noqa: N802
+    """Query string parameter, `name` defaults to the argument name."""
+    return QueryMarker(name, default)
@@ -1,7 +1,7 @@
 import threading
-from _contextvars import ContextVar
-from http import HTTPStatus
-from typing import Any
+from collections.abc import Callable, Iterable, Mapping
+from http import HTTPMethod, HTTPStatus
+from typing import Any, override
 
 import msgspec
 from dependency_injector.containers import DeclarativeContainer
@@ -9,12 +9,50 @@ from dependency_injector.wiring import clear_cache
 
 from pulya import RequestContainer
 from pulya.asgi import ASGIApplication
-from pulya.request import Request
-from pulya.responses import Response
-from pulya.routing import Router
+from pulya.cache import DEFAULT_MAX_BYTES, Cache
+from pulya.metrics import UNMATCHED, Metrics
+from pulya.middleware import CallNext, Middleware, compose
+from pulya.request import (
+    BodyTooLargeError,
+    Request,
+    RequestValidationError,
+    active_request,
+)
+from pulya.responses import JSON_HEADERS, Response
+from pulya.routing import WEBSOCKET, Execution, Route, RouteMethod, Router
 from pulya.rsgi import RSGIApplication
+from pulya.serialization import encode_json
+from pulya.tracing import MATCH, Tracer
+from pulya.websocket import POLICY_VIOLATION, WebSocket, WebSocketDisconnectError
+from pulya.wiring import wired_modules
 
-active_request: ContextVar[Request] = ContextVar("active_request")
+__all__ = ["Pulya", "active_request"]
+
+_NOT_FOUND_CONTENT = msgspec.json.encode({"error": "Not found."})
+_TOO_LARGE_CONTENT = msgspec.json.encode({"error": "Request body is too large."})
+
+
+async def _not_found(_request: Request) -> Response:
+    return Response(
+        status=HTTPStatus.NOT_FOUND,
+        headers=list(JSON_HEADERS.rsgi),
+        content=_NOT_FOUND_CONTENT,
+    )
+
+
+def _validation_error(error: RequestValidationError) -> Response:
+    return Response(
+        status=HTTPStatus.UNPROCESSABLE_ENTITY,
+        headers=list(JSON_HEADERS.rsgi),
+        content=encode_json(
+            {
+                "error": "Request validation failed.",
+                "location": error.location,
+                "detail": error.detail,
+                "path": error.path,
+            }
+        ),
+    )
 
 
 class Pulya[T: DeclarativeContainer](Router, RSGIApplication, ASGIApplication):
@@ -26,48 +64,185 @@ class Pulya[T: DeclarativeContainer](Router, RSGIApplication, ASGIApplication):
 
     container: T | None = None
 
-    def __init__(self, container_class: type[T]) -> None:
-        super().__init__()
+    def __init__(  # noqa: PLR0913
+        self,
+        container_class: type[T],
+        *,
+        max_body_size: int | None = None,
+        match_cache_size: int = 0,
+        response_cache_size: int = DEFAULT_MAX_BYTES,
+        threadpool_size: int | None = None,
+        metrics: Metrics | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
+        super().__init__(
+            match_cache_size=match_cache_size,
+            response_cache_size=response_cache_size,
+            threadpool_size=threadpool_size,
+        )
         self.container_class = container_class
-        self._di_lock = threading.Lock()
+        self.max_body_size = max_body_size
+        self._startup_lock = threading.Lock()
+        #: Number of started worker threads sharing the application.
+        self._workers = 0
+        self._middleware: list[Middleware] = []
+        self._not_found: CallNext = _not_found
+        self._started = False
+        #: Tracer of sampled requests stages, nothing is traced if None.
+        self.tracer = tracer
+        #: Request metrics, requests are not measured if None.
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.gauges["pulya_executor_pending"] = lambda: self.executor.pending
+            metrics.gauges["pulya_executor_saturation"] = (
+                lambda: self.executor.saturation
+            )
+
+    def add_middleware(self, middleware: Middleware) -> Middleware:
+        """
+        Register middleware applied to every route.
+
+        Routes may skip it with `skip_middleware` or add their own ones with
+        `middleware` arguments. Middleware stacks are composed on startup.
+        """
+        self._middleware.append(middleware)
+        if self._started:
+            self._compile_middleware()
+        return middleware
+
+    @override
+    def add_route(
+        self,
+        method: RouteMethod,
+        url_pattern: str,
+        handler: Callable[..., Any],
+        *,
+        middleware: Iterable[Middleware] = (),
+        skip_middleware: Iterable[Middleware] = (),
+        cache: Cache | None = None,
+        execution: Execution = "threadpool",
+        msgpack: bool = False,
+    ) -> Route:
+        route = super().add_route(
+            method,
+            url_pattern,
+            handler,
+            middleware=middleware,
+            skip_middleware=skip_middleware,
+            cache=cache,
+            execution=execution,
+            msgpack=msgpack,
+        )
+        if self._started:
+            route.compile_middleware(self._middleware)
+        return route
+
+    def mount_metrics(self, path: str = "/metrics") -> None:
+        """Expose :py:attr:`metrics` to Prometheus on the `path`."""
+        if self.metrics is None:
+            msg = "Metrics are not enabled, pass `metrics` to the application."
+            raise RuntimeError(msg)
+        self.add_route(HTTPMethod.GET, path, self.metrics.serve)
+
+    def _compile_middleware(self) -> None:
+        self._not_found = compose(self._middleware, _not_found)
+        for route in self.routes:
+            route.compile_middleware(self._middleware)
 
     async def handle_http_request(self, request: Request) -> Any:
+        if self.tracer is not None:
+            request.trace = self.tracer.start(request)
         match = self.match_route(request.method, request.path)
+        if self.metrics is None:
+            return await self._dispatch(request, match)
+        route = UNMATCHED if match is None else match[0].url_pattern
+        return await self.metrics.measure(route, self._dispatch(request, match))
 
+    async def _dispatch(
+        self, request: Request, match: tuple[Route, Mapping[str, str]] | None
+    ) -> Any:
+        trace = request.trace
+        if trace is not None:
+            trace.route = None if match is None else match[0].url_pattern
+            trace.mark(MATCH)
         if match is None:
+            return await self._not_found(request)
+        route, match_dict = match
+        request.route = route
+        try:
+            if trace is not None and route.chain is None and route.cache is None:
+                return await route.invoke_traced(request, match_dict, trace)
+            if route.chain is None:
+                return await route.invoke(request, match_dict)
+            request.path_params = match_dict
+            return await route.chain(request)
+        except BodyTooLargeError:
             return Response(
-                status=HTTPStatus.NOT_FOUND,
-                headers=[],
-                content=msgspec.json.encode({"error": "Not found."}),
+                status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                headers=list(JSON_HEADERS.rsgi),
+                content=_TOO_LARGE_CONTENT,
             )
-        route, match_dict = match
-        validated_path_params = msgspec.convert(
-            match_dict, type=route.path_params_schema, strict=False
-        )
+        except RequestValidationError as e:
+            return _validation_error(e)
+
+    async def handle_websocket(self, websocket: WebSocket) -> None:
+        match = self.match_route(WEBSOCKET, websocket.path)
 
-        handler_params = msgspec.structs.asdict(validated_path_params)
-        token = active_request.set(request)
+        if match is None:
+            await websocket.close(POLICY_VIOLATION)
+            return
+        route, match_dict = match
         try:
-            return await route.handler(**handler_params)
-        finally:
-            active_request.reset(token)
+            if route.chain is None:
+                await route.invoke(websocket, match_dict)
+            else:
+                websocket.path_params = match_dict
+                await route.chain(websocket)
+        except WebSocketDisconnectError:
+            return
+        except RequestValidationError:
+            await websocket.close(POLICY_VIOLATION)
+            return
+        await websocket.close()
 
     async def on_startup(self) -> None:
-        # dependency-injector is unstable in free-threading mode
-        # so creating container sequentially
-        with self._di_lock:
+        """
+        Start the application, once for all worker threads.
+
+        Granian thread workers each call startup on their own event loop.
+        Wiring patches handler modules for the whole process, so the container
+        is created and wired by the first worker only, others share it.
+        Resources are initialized on the first worker's loop, async resources
+        bound to it are used from the loops of other workers too.
+        """
+        with self._startup_lock:
+            self._workers += 1
+            if self._workers > 1:
+                return
+            self._compile_middleware()
+            self._started = True
             request_container = RequestContainer(ctx=active_request)
             self.container = self.container_class(request=request_container)
             self.container.check_dependencies()
             if fut := self.container.init_resources():
                 await fut  # pragma: no cover
-            request_container.wiring_config = self.container.wiring_config
-            # DI package has incomplete typings. Will be fixed in the upcoming release.
-            self.container.wire(keep_cache=True)  # type: ignore[call-arg]
-            request_container.wire(keep_cache=True)  # type: ignore[call-arg]
+            # Modules without markers have nothing to wire, skip inspecting them.
+            if modules := wired_modules(self.container):
+                # DI package has incomplete typings.
+                self.container.wire(  # type: ignore[call-arg]
+                    modules=modules, packages=[], keep_cache=True
+                )
+                request_container.wire(  # type: ignore[call-arg]
+                    modules=modules, packages=[], keep_cache=True
+                )
             clear_cache()
 
     async def on_shutdown(self) -> None:
-        with self._di_lock:
+        """Shutdown the application once the last worker thread stops."""
+        with self._startup_lock:
+            self._workers -= 1
+            if self._workers > 0:
+                return
             if self.container and (fut := self.container.shutdown_resources()):
                 await fut  # pragma: no cover
+            self.executor.shutdown(wait=False)
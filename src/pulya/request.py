@@ -1,18 +1,182 @@
+from asyncio import CancelledError, Future, get_running_loop
+from collections.abc import AsyncIterator, Hashable, Mapping
+from contextvars import ContextVar
 from http import HTTPMethod
-from typing import Protocol
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Protocol
 
 from pulya.headers import Headers
 
+if TYPE_CHECKING:
+    from pulya.routing import Route
+    from pulya.tracing import Trace
+
+_NO_PARAMS: Mapping[str, str] = MappingProxyType({})
+
+
+class BodyTooLargeError(Exception):
+    """Request body exceeds configured maximum body size."""
+
+
+class RequestValidationError(Exception):
+    """
+    Request body or params failed msgspec decoding or validation.
+
+    The msgspec message is split into the error and the path of the invalid
+    value, e.g. `$.items[0].name`, if there is one.
+    """
+
+    def __init__(self, message: str, location: str) -> None:
+        super().__init__(message, location)
+        self.location = location
+        detail, sep, path = message.rpartition(" - at `")
+        self.detail = detail if sep else message
+        self.path = path.removesuffix("`") if sep else None
+
 
 class Request(Protocol):
+    #: Raw params of the matched route path, filled for middleware.
+    path_params: Mapping[str, str]
+    #: Stage timings of the request, None if the request is not sampled.
+    trace: "Trace | None"
+    #: Matched route, None until the request is routed.
+    route: "Route | None"
+
     @property
     def method(self) -> HTTPMethod: ...
 
     @property
     def path(self) -> str: ...
 
+    @property
+    def query_string(self) -> str:
+        """Raw query string, without leading `?`."""
+        ...
+
     @property
     def headers(self) -> Headers: ...
 
+    @property
+    def cache(self) -> dict[Hashable, Any]:
+        """Request-scoped cache of values derived from the request."""
+        ...
+
     async def get_content(self) -> bytes:
-        """Read whole request body."""
+        """Read whole request body, the body is read only once."""
+
+    def stream(self) -> AsyncIterator[bytes]:
+        """Iterate over request body chunks as they are received."""
+        ...
+
+
+class BaseRequest(Request):
+    """
+    Base of protocol request adapters.
+
+    Memoizes values derived from the request: headers object, raw body and
+    anything stored in :py:attr:`cache`. Concurrent readers of the body
+    (e.g. dependencies resolved together) wait for a single read.
+    """
+
+    __slots__ = (
+        "_body_waiters",
+        "_cache",
+        "_content",
+        "_headers",
+        "_max_body_size",
+        "path_params",
+        "route",
+        "trace",
+    )
+
+    def __init__(self, max_body_size: int | None = None) -> None:
+        self.path_params: Mapping[str, str] = _NO_PARAMS
+        self.trace: Trace | None = None
+        self.route: Route | None = None
+        self._max_body_size = max_body_size
+        self._headers: Headers | None = None
+        self._content: bytes | None = None
+        self._body_waiters: list[Future[bytes]] | None = None
+        self._cache: dict[Hashable, Any] | None = None
+
+    @property
+    def headers(self) -> Headers:
+        """HTTP headers, built on first access."""
+        if self._headers is None:
+            self._headers = self._make_headers()
+        return self._headers
+
+    @property
+    def cache(self) -> dict[Hashable, Any]:
+        """Request-scoped cache of values derived from the request."""
+        if self._cache is None:
+            self._cache = {}
+        return self._cache
+
+    async def get_content(self) -> bytes:
+        """Read and return the whole request body, read only once."""
+        if self._content is not None:
+            return self._content
+        if self._body_waiters is not None:
+            waiter: Future[bytes] = get_running_loop().create_future()
+            self._body_waiters.append(waiter)
+            return await waiter
+
+        waiters: list[Future[bytes]] = []
+        self._body_waiters = waiters
+        try:
+            self._content = await self._read_content()
+        except BaseException as e:
+            # Cancellation too, otherwise waiters and later reads hang forever.
+            self._body_waiters = None
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if isinstance(e, CancelledError):
+                    waiter.cancel()
+                else:
+                    waiter.set_exception(e)
+            raise
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(self._content)
+        return self._content
+
+    def _make_headers(self) -> Headers:
+        raise NotImplementedError
+
+    async def _read_content(self) -> bytes:
+        raise NotImplementedError
+
+
+def check_content_length(headers: Headers, max_body_size: int) -> int | None:
+    """
+    Reject request declaring body larger than `max_body_size`.
+
+    Returns declared content length if any.
+    """
+    content_length = headers.get_first("content-length")
+    if content_length is None or not content_length.isdigit():
+        return None
+    if int(content_length) > max_body_size:
+        msg = f"Request body is larger than {max_body_size} bytes"
+        raise BodyTooLargeError(msg)
+    return int(content_length)
+
+
+async def limit_body(
+    chunks: AsyncIterator[bytes], max_body_size: int
+) -> AsyncIterator[bytes]:
+    """Pass body chunks through until more than `max_body_size` is received."""
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_body_size:
+            msg = f"Request body is larger than {max_body_size} bytes"
+            raise BodyTooLargeError(msg)
+        yield chunk
+
+
+#: Request being handled in the current context. Set only for routes which
+#: resolve dependencies through dependency-injector markers.
+active_request: ContextVar[Request] = ContextVar("active_request")
@@ -1,4 +1,14 @@
+from collections.abc import AsyncIterable
 from http import HTTPStatus
+from typing import Any
+
+from pulya.request import Request
+from pulya.serialization import (
+    MSGPACK_MEDIA_TYPES,
+    encode_json,
+    encode_msgpack,
+    prefers_msgpack,
+)
 
 
 class BaseResponse:
@@ -25,3 +35,98 @@ class Response(BaseResponse):
         super().__init__(status=status, headers=headers)
         self.headers = headers or []
         self.content = content
+
+
+class StreamingResponse(BaseResponse):
+    """
+    Response with a body produced by an async iterator.
+
+    Chunks are sent to the client as soon as they are produced,
+    without buffering the whole body in memory.
+    """
+
+    __slots__ = ["content", "headers", "status"]
+
+    def __init__(
+        self,
+        content: AsyncIterable[bytes | str],
+        status: HTTPStatus = HTTPStatus.OK,
+        headers: list[tuple[str, str]] | None = None,
+    ) -> None:
+        super().__init__(status=status, headers=headers)
+        self.content = content
+
+
+class FileResponse(BaseResponse):
+    """
+    Response with a body read from a file on disk.
+
+    Servers supporting it send the file without reading it in python.
+    `byte_range` limits the body to the `[start, end)` part of the file.
+    """
+
+    __slots__ = ["byte_range", "headers", "path", "status"]
+
+    def __init__(
+        self,
+        path: str,
+        status: HTTPStatus = HTTPStatus.OK,
+        headers: list[tuple[str, str]] | None = None,
+        byte_range: tuple[int, int] | None = None,
+    ) -> None:
+        super().__init__(status=status, headers=headers)
+        self.path = path
+        self.byte_range = byte_range
+
+
+class ContentHeaders:
+    """Headers of handler results which are not responses, in both encodings."""
+
+    __slots__ = ["asgi", "rsgi"]
+
+    def __init__(self, content_type: str) -> None:
+        self.rsgi = [("content-type", content_type)]
+        self.asgi = [(b"content-type", content_type.encode())]
+
+
+JSON_HEADERS = ContentHeaders("application/json")
+TEXT_HEADERS = ContentHeaders("text/plain")
+MSGPACK_HEADERS = ContentHeaders(MSGPACK_MEDIA_TYPES[0])
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    Check structured results of the request should be encoded as MessagePack.
+
+    Only routes registered with `msgpack=True` negotiate the format, others
+    always respond with JSON without looking at request headers.
+    """
+    route = request.route
+    return (
+        route is not None
+        and route.msgpack
+        and prefers_msgpack(request.headers.get_first("accept"))
+    )
+
+
+def render_response(
+    result: Any,
+    content_headers: ContentHeaders | None = None,
+    *,
+    msgpack: bool = False,
+) -> BaseResponse:
+    """
+    Convert handler result into a response, the way adapters send it.
+
+    Structured results are encoded as MessagePack if `msgpack` is set.
+    """
+    if isinstance(result, BaseResponse):
+        return result
+    if isinstance(result, str | bytes):
+        content = result.encode() if isinstance(result, str) else result
+        return Response(content, headers=list((content_headers or TEXT_HEADERS).rsgi))
+    if msgpack:
+        return Response(encode_msgpack(result), headers=list(MSGPACK_HEADERS.rsgi))
+    return Response(
+        encode_json(result), headers=list((content_headers or JSON_HEADERS).rsgi)
+    )
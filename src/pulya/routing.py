@@ -1,62 +1,571 @@
-from collections import defaultdict
-from collections.abc import Callable, Mapping
+import asyncio
+import inspect
+import re
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from functools import lru_cache, partial
 from http import HTTPMethod
-from typing import Any, Protocol, TypeVar, get_args, get_type_hints
+from types import UnionType
+from typing import (
+    Annotated,
+    Any,
+    Literal,
+    Protocol,
+    TypeVar,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+from urllib.parse import parse_qsl
+from weakref import WeakKeyDictionary
 
 import msgspec
+from dependency_injector.wiring import _is_patched
 from matchit import Router as MatchitRouter
+from msgspec import NODEFAULT
+
+from pulya.cache import DEFAULT_MAX_BYTES, Cache, CacheStore
+from pulya.containers import RequestContainer
+from pulya.executor import HandlerExecutor
+from pulya.middleware import CallNext, Middleware, compose
+from pulya.params import NativeMarker, QueryMarker
+from pulya.request import (
+    _NO_PARAMS,
+    Request,
+    RequestValidationError,
+    active_request,
+)
+from pulya.responses import JSON_HEADERS, TEXT_HEADERS, ContentHeaders
+from pulya.staticfiles import StaticFiles
+from pulya.tracing import CONVERT, INJECT, Trace
+from pulya.websocket import WebSocket
 
 T = TypeVar("T", bound=Callable[..., Any])
 
+#: Compiled route handler call: takes request and raw path params.
+Invoker = Callable[[Request, Mapping[str, str]], Awaitable[Any]]
+
+#: Route handler call recording stages into the trace.
+TracedInvoker = Callable[[Request, Mapping[str, str], Trace], Awaitable[Any]]
+
+#: Pseudo-method of websocket routes, kept in their own routing tree.
+WEBSOCKET: Literal["WEBSOCKET"] = "WEBSOCKET"
+
+RouteMethod = HTTPMethod | Literal["WEBSOCKET"]
+
+#: How sync handlers are called: on the event loop or in the thread pool.
+Execution = Literal["inline", "threadpool"]
+
+#: Methods whose responses may be cached, others change state.
+_CACHEABLE_METHODS = frozenset({HTTPMethod.GET, HTTPMethod.HEAD})
+
+_PATH_PARAM_RE = re.compile(r"{\*?(\w+)}")
+
+_EMPTY = inspect.Parameter.empty
+
+_JSON_ORIGINS: tuple[type, ...] = (dict, list)
+
+#: Params struct field: name, type hint, default and alias.
+_Field = tuple[str, Any, Any, str | None]
+
+#: Handler type hints and param defaults.
+_Introspection = tuple[dict[str, Any], dict[str, Any]]
+
+#: Number of distinct params structs kept for sharing between routes.
+_STRUCTS_CACHE_SIZE = 4096
+
+#: Introspection results by handler function and whether it is bound, see
+#: :py:func:`_introspect`. Weak keys let handlers and their instances go.
+_introspections: WeakKeyDictionary[Callable[..., Any], dict[bool, _Introspection]] = (
+    WeakKeyDictionary()
+)
+
 
 class CreateRouteSignature(Protocol):
-    def __call__(self, url_pattern: str) -> Callable[[T], T]:
+    def __call__(  # noqa: PLR0913
+        self,
+        url_pattern: str,
+        *,
+        middleware: Iterable[Middleware] = (),
+        skip_middleware: Iterable[Middleware] = (),
+        cache: Cache | None = None,
+        execution: Execution = "threadpool",
+        msgpack: bool = False,
+    ) -> Callable[[T], T]:
         """Helpful method"""
         ...
 
 
+def _is_marker(value: Any) -> bool:
+    return getattr(value, "__IS_MARKER__", False) is True
+
+
+class _RequestMarker(NativeMarker):
+    def __init__(self) -> None:
+        super().__init__(RequestContainer.request)
+
+    def resolve(self, request: Request) -> Request:
+        return request
+
+
+_REQUEST_MARKER = _RequestMarker()
+
+
+def _is_async(handler: Callable[..., Any]) -> bool:
+    return inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(
+        getattr(handler, "__call__", None)  # noqa: B004
+    )
+
+
+def _unwrap_injected(handler: Callable[..., Any]) -> Callable[..., Any]:
+    """Strip `@inject` decorator from handler which has no DI dependencies."""
+    if _is_patched(handler):
+        return cast("Callable[..., Any]", handler.__wrapped__)  # type: ignore[attr-defined]
+    return handler
+
+
+def _with_request_context(invoke: Invoker) -> Invoker:
+    """Expose request to dependency-injector providers while handler runs."""
+
+    async def invoke_with_context(request: Request, params: Mapping[str, str]) -> Any:
+        token = active_request.set(request)
+        try:
+            return await invoke(request, params)
+        finally:
+            active_request.reset(token)
+
+    return invoke_with_context
+
+
+def _invoke_with_injections(
+    handler: Callable[..., Any],
+    convert: Callable[[Mapping[str, str]], dict[str, Any]] | None,
+    parse_query: Callable[[str], dict[str, Any]] | None,
+    markers: Mapping[str, NativeMarker],
+) -> Invoker:
+    """Build handler call resolving query params and injected arguments."""
+    injections = [(k, m.resolve) for k, m in markers.items() if not m.is_async]
+    async_injections = [(k, m.resolve) for k, m in markers.items() if m.is_async]
+
+    if not async_injections:
+
+        def invoke(request: Request, params: Mapping[str, str]) -> Any:
+            kwargs = {} if convert is None else convert(params)
+            if parse_query is not None:
+                kwargs.update(parse_query(request.query_string))
+            for name, resolve in injections:
+                kwargs[name] = resolve(request)
+            return handler(**kwargs)
+
+        return invoke
+
+    async def invoke_async(request: Request, params: Mapping[str, str]) -> Any:
+        kwargs = {} if convert is None else convert(params)
+        if parse_query is not None:
+            kwargs.update(parse_query(request.query_string))
+        for name, resolve in injections:
+            kwargs[name] = resolve(request)
+        for name, resolve in async_injections:
+            kwargs[name] = await resolve(request)
+        return await handler(**kwargs)
+
+    return invoke_async
+
+
+def _traced_invoker(
+    handler: Callable[..., Awaitable[Any]],
+    convert: Callable[[Mapping[str, str]], dict[str, Any]] | None,
+    parse_query: Callable[[str], dict[str, Any]] | None,
+    markers: Mapping[str, NativeMarker],
+    *,
+    uses_di: bool,
+) -> TracedInvoker:
+    """Build handler call marking `convert` and `inject` stages."""
+
+    async def invoke(request: Request, params: Mapping[str, str], trace: Trace) -> Any:
+        kwargs = {} if convert is None else convert(params)
+        if parse_query is not None:
+            kwargs.update(parse_query(request.query_string))
+        trace.mark(CONVERT)
+        for name, marker in markers.items():
+            value = marker.resolve(request)
+            kwargs[name] = await value if marker.is_async else value
+        trace.mark(INJECT)
+        if not uses_di:
+            return await handler(**kwargs)
+        token = active_request.set(request)
+        try:
+            return await handler(**kwargs)
+        finally:
+            active_request.reset(token)
+
+    return invoke
+
+
+def _find_query_marker(hint: Any, default: Any) -> QueryMarker | None:
+    if isinstance(default, QueryMarker):
+        return default
+    return next((m for m in get_args(hint) if isinstance(m, QueryMarker)), None)
+
+
+def _query_field(name: str, hint: Any, default: Any) -> _Field:
+    """Build query params struct field, `Query` marker may rename it."""
+    marker = _find_query_marker(hint, default)
+    if marker is not None and (marker is default or marker.default is not NODEFAULT):
+        default = marker.default
+    if default is _EMPTY:
+        default = NODEFAULT
+    alias = None if marker is None else marker.name
+    if marker is not None and get_origin(hint) is Annotated:
+        # The marker is unique per handler, strip it so the field is shareable.
+        hint, *metadata = get_args(hint)
+        metadata.remove(marker)
+        if metadata:
+            hint = Annotated[hint, *metadata]
+    return name, hint, default, alias
+
+
+def _params_struct(
+    name: str, fields: Iterable[_Field], *, kw_only: bool = False
+) -> type[msgspec.Struct]:
+    """
+    Struct of route params, built once per name and fields.
+
+    Routes with equal signatures share the struct type, so registering
+    many of them costs neither a type nor its decoding plan per route.
+    """
+    fields = tuple(fields)
+    try:
+        return _shared_struct(name, fields, kw_only=kw_only)
+    except TypeError:  # Unhashable hint or default, the struct can't be shared.
+        return _defstruct(name, fields, kw_only=kw_only)
+
+
+def _defstruct(
+    name: str, fields: Iterable[_Field], *, kw_only: bool
+) -> type[msgspec.Struct]:
+    return msgspec.defstruct(
+        name,
+        [
+            (field, hint, msgspec.field(default=default, name=alias))
+            for field, hint, default, alias in fields
+        ],
+        kw_only=kw_only,
+    )
+
+
+_shared_struct = lru_cache(maxsize=_STRUCTS_CACHE_SIZE)(_defstruct)
+
+
+@lru_cache(maxsize=_STRUCTS_CACHE_SIZE)
+def _sequence_fields(schema: type[msgspec.Struct]) -> frozenset[str]:
+    """Query keys of params struct taking all values of a repeated key."""
+    return frozenset(
+        f.encode_name for f in msgspec.structs.fields(schema) if _is_sequence(f.type)
+    )
+
+
+def _introspect(handler: Callable[..., Any]) -> _Introspection:
+    """Type hints and param defaults of the handler, computed once per handler."""
+    func = getattr(handler, "__func__", handler)
+    bound = func is not handler
+    by_binding = _introspections.setdefault(func, {})
+    introspection = by_binding.get(bound)
+    if introspection is None:
+        introspection = by_binding[bound] = _inspect_handler(handler)
+    return introspection
+
+
+def _inspect_handler(handler: Callable[..., Any]) -> _Introspection:
+    defaults = {k: p.default for k, p in inspect.signature(handler).parameters.items()}
+    return get_type_hints(handler, include_extras=True), defaults
+
+
+def _content_headers(hint: Any) -> ContentHeaders | None:
+    """Headers of results of the annotated type, None if it is not known."""
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _content_headers(get_args(hint)[0])
+    if origin is Union or origin is UnionType:
+        options = {
+            _content_headers(arg) for arg in get_args(hint) if arg is not type(None)
+        }
+        return options.pop() if len(options) == 1 else None
+    if hint is str or hint is bytes:
+        return TEXT_HEADERS
+    if origin in _JSON_ORIGINS or hint in _JSON_ORIGINS:
+        return JSON_HEADERS
+    if isinstance(hint, type) and issubclass(hint, msgspec.Struct):
+        return JSON_HEADERS
+    return None
+
+
+def _is_sequence(hint: Any) -> bool:
+    """Whether the query param takes all values of a repeated key."""
+    origin = get_origin(hint)
+    if origin is Annotated:
+        return _is_sequence(get_args(hint)[0])
+    if origin in {Union, UnionType}:
+        return any(_is_sequence(arg) for arg in get_args(hint))
+    return origin in {list, tuple, set, frozenset}
+
+
 class Route:
     __slots__ = [
         "body_arg_name",
         "body_arg_schema",
+        "cache",
+        "chain",
+        "content_headers",
+        "execution",
+        "executor",
         "handler",
         "handler_type_hint",
+        "injections",
+        "invoke",
+        "invoke_traced",
         "method",
+        "middleware",
+        "msgpack",
         "path_params_schema",
+        "query_params_schema",
+        "skip_middleware",
         "url_pattern",
+        "uses_di",
     ]
 
-    def __init__(
-        self, method: HTTPMethod, url_pattern: str, handler: Callable[..., Any]
+    def __init__(  # noqa: PLR0913
+        self,
+        method: RouteMethod,
+        url_pattern: str,
+        handler: Callable[..., Any],
+        *,
+        middleware: Iterable[Middleware] = (),
+        skip_middleware: Iterable[Middleware] = (),
+        execution: Execution = "threadpool",
+        executor: HandlerExecutor | None = None,
+        msgpack: bool = False,
     ) -> None:
         self.method = method
         self.handler = handler
         self.url_pattern = url_pattern
+        #: Policy of calling sync handler, ignored for coroutine functions.
+        self.execution = execution
+        #: Pool of sync handlers, default executor of the loop is used if None.
+        self.executor = executor
+        #: Middleware applied to the route in addition to application ones.
+        self.middleware = tuple(middleware)
+        #: Application middleware not applied to the route.
+        self.skip_middleware = frozenset(skip_middleware)
+        #: Middleware stack around the handler, None if there is no middleware.
+        self.chain: CallNext | None = None
+        #: Response cache of the route, set by the router.
+        self.cache: Cache | None = None
+        #: Encode structured results as MessagePack for clients preferring it.
+        self.msgpack = msgpack
 
-        self.handler_type_hint = get_type_hints(handler, include_extras=True)
+        self.handler_type_hint, defaults = _introspect(handler)
+        #: Headers of results which are not responses, None to guess by value.
+        self.content_headers = _content_headers(self.handler_type_hint.get("return"))
 
-        fields = set(self.handler_type_hint.keys()) - {"return"}
+        fields = {k: v for k, v in self.handler_type_hint.items() if k != "return"}
 
+        # Arguments resolved from the request natively, without DI
+        self.injections: dict[str, NativeMarker] = {}
         # Remove fields handled by DI
-        for k, param in self.handler_type_hint.items():
-            param_args = get_args(param)
-            for arg in param_args:
-                if getattr(arg, "__IS_MARKER__", False):
-                    fields.remove(k)
-                    break
+        self.uses_di = False
+        markers = {
+            k: marker
+            for k, param in self.handler_type_hint.items()
+            for marker in get_args(param)
+            if _is_marker(marker)
+        }
+        for name, default in defaults.items():
+            if _is_marker(default):
+                markers.setdefault(name, default)
+        for name, marker in markers.items():
+            fields.pop(name, None)
+            if isinstance(marker, NativeMarker):
+                self.injections[name] = marker
+            else:
+                self.uses_di = True
+        for k, v in list(fields.items()):
+            if v is Request or v is WebSocket:
+                self.injections[k] = _REQUEST_MARKER
+                fields.pop(k)
+
+        # Fields missing in the url pattern are taken from the query string
+        pattern_params = set(_PATH_PARAM_RE.findall(url_pattern))
+        query_fields = [
+            _query_field(k, v, defaults.get(k, _EMPTY))
+            for k, v in fields.items()
+            if k not in pattern_params
+            or _find_query_marker(v, defaults.get(k)) is not None
+        ]
+        for name, *_ in query_fields:
+            fields.pop(name)
+        self.query_params_schema = (
+            _params_struct("QueryParams", query_fields, kw_only=True)
+            if query_fields
+            else None
+        )
+
+        self.path_params_schema = _params_struct(
+            "PathParams", [(k, v, NODEFAULT, None) for k, v in fields.items()]
+        )
+        self.invoke, self.invoke_traced = self._compile_invokers(fields)
+
+    def compile_middleware(self, app_middleware: Iterable[Middleware]) -> None:
+        """
+        Compose application and route middleware into :py:attr:`chain`.
+
+        Application middleware handles HTTP requests only, websocket routes
+        are wrapped in their own `middleware` alone.
+        """
+        if self.method == WEBSOCKET:
+            app_middleware = ()
+        stack = [m for m in app_middleware if m not in self.skip_middleware]
+        stack += [m for m in self.middleware if m not in stack]
+        if not stack:
+            self.chain = None
+            return
+
+        invoke = self.invoke
+
+        def endpoint(request: Request) -> Awaitable[Any]:
+            return invoke(request, request.path_params)
+
+        self.chain = compose(stack, endpoint)
+
+    def _compile_path_params(
+        self, fields: Mapping[str, Any]
+    ) -> Callable[[Mapping[str, str]], dict[str, Any]] | None:
+        """Build conversion of raw path params into handler kwargs."""
+        if not fields:
+            return None
+        pattern_params = set(_PATH_PARAM_RE.findall(self.url_pattern))
+        if set(fields) == pattern_params and all(t is str for t in fields.values()):
+            return dict
+
+        schema = self.path_params_schema
+
+        def convert(params: Mapping[str, str]) -> dict[str, Any]:
+            try:
+                validated = msgspec.convert(params, type=schema, strict=False)
+            except msgspec.ValidationError as e:
+                raise RequestValidationError(str(e), "path") from None
+            return msgspec.structs.asdict(validated)
+
+        return convert
+
+    def _compile_query_params(self) -> Callable[[str], dict[str, Any]] | None:
+        """Build parsing of the query string into handler kwargs."""
+        schema = self.query_params_schema
+        if schema is None:
+            return None
+        multi = _sequence_fields(schema)
+
+        def parse(query_string: str) -> dict[str, Any]:
+            values: dict[str, Any] = {}
+            for key, value in parse_qsl(query_string, keep_blank_values=True):
+                if key in multi:
+                    values.setdefault(key, []).append(value)
+                else:
+                    values[key] = value
+            try:
+                validated = msgspec.convert(values, type=schema, strict=False)
+            except msgspec.ValidationError as e:
+                raise RequestValidationError(str(e), "query") from None
+            return msgspec.structs.asdict(validated)
+
+        return parse
+
+    def _compile_invokers(
+        self, fields: Mapping[str, Any]
+    ) -> tuple[Invoker, TracedInvoker]:
+        """
+        Build the cheapest call of the handler for this route.
+
+        Stages which the handler does not need (path params validation,
+        request context for dependency-injector) are skipped entirely.
+        The traced call is used for sampled requests only.
+        """
+        handler = self.handler if self.uses_di else _unwrap_injected(self.handler)
+        if not _is_async(handler):
+            handler = self._compile_sync_handler(handler)
+        convert = self._compile_path_params(fields)
+        parse_query = self._compile_query_params()
+
+        traced = _traced_invoker(
+            handler, convert, parse_query, self.injections, uses_di=self.uses_di
+        )
 
-        self.path_params_schema = msgspec.defstruct("PathParams", fields=fields)
+        invoke: Invoker
+        if self.injections or parse_query is not None:
+            invoke = _invoke_with_injections(
+                handler, convert, parse_query, self.injections
+            )
+        elif convert is None:
+
+            def invoke(_request: Request, _params: Mapping[str, str]) -> Any:
+                return handler()
+
+        elif convert is dict:
+
+            def invoke(_request: Request, params: Mapping[str, str]) -> Any:
+                return handler(**params)
+
+        else:
+
+            def invoke(_request: Request, params: Mapping[str, str]) -> Any:
+                return handler(**convert(params))
+
+        if self.uses_di:
+            invoke = _with_request_context(invoke)
+        return invoke, traced
+
+    def _compile_sync_handler(
+        self, handler: Callable[..., Any]
+    ) -> Callable[..., Awaitable[Any]]:
+        """Adapt sync handler to be awaited according to :py:attr:`execution`."""
+        if self.execution == "inline":
+
+            async def call_inline(**kwargs: Any) -> Any:
+                return handler(**kwargs)
+
+            return call_inline
+
+        executor = self.executor
+        if executor is None:
+            return partial(asyncio.to_thread, handler)
+        return partial(executor.run, handler)
 
 
 class _MethodFactory:
-    def __init__(self, method: HTTPMethod) -> None:
+    def __init__(self, method: RouteMethod) -> None:
         self.method = method
 
     def __get__(self, instance: "Router", owner: type) -> CreateRouteSignature:
-        def _method(url_pattern: str) -> Callable[[T], T]:
+        def _method(  # noqa: PLR0913
+            url_pattern: str,
+            *,
+            middleware: Iterable[Middleware] = (),
+            skip_middleware: Iterable[Middleware] = (),
+            cache: Cache | None = None,
+            execution: Execution = "threadpool",
+            msgpack: bool = False,
+        ) -> Callable[[T], T]:
             def _inner(handler: T) -> T:
                 instance.add_route(
-                    self.method, url_pattern=url_pattern, handler=handler
+                    self.method,
+                    url_pattern=url_pattern,
+                    handler=handler,
+                    middleware=middleware,
+                    skip_middleware=skip_middleware,
+                    cache=cache,
+                    execution=execution,
+                    msgpack=msgpack,
                 )
                 return handler
 
@@ -66,27 +575,149 @@ class _MethodFactory:
 
 
 class Router:
-    def __init__(self) -> None:
-        self._routers_by_method: dict[HTTPMethod, MatchitRouter[Route]] = defaultdict(
-            lambda: MatchitRouter()
-        )
+    """
+    Registry of routes.
+
+    Routes without path params are looked up in a per-method dict before
+    falling back to matchit. Matches of dynamic paths can additionally be
+    kept in a bounded LRU cache of `match_cache_size` entries.
+    """
+
+    def __init__(
+        self,
+        match_cache_size: int = 0,
+        response_cache_size: int = DEFAULT_MAX_BYTES,
+        threadpool_size: int | None = None,
+    ) -> None:
+        self._routers_by_method: dict[RouteMethod, MatchitRouter[Route]] = {}
+        self._static_routes: dict[RouteMethod, dict[str, Route]] = {}
+        self.routes: list[Route] = []
+        #: Responses of routes registered with `cache` option.
+        self.response_cache = CacheStore(response_cache_size)
+        #: Thread pool of sync handlers registered with `threadpool` execution.
+        self.executor = HandlerExecutor(threadpool_size)
+        self._match_cache_size = match_cache_size
+        self._match_dynamic = self._build_dynamic_matcher()
 
     get = _MethodFactory(HTTPMethod.GET)
     post = _MethodFactory(HTTPMethod.POST)
     put = _MethodFactory(HTTPMethod.PUT)
     delete = _MethodFactory(HTTPMethod.DELETE)
+    head = _MethodFactory(HTTPMethod.HEAD)
+    websocket = _MethodFactory(WEBSOCKET)
 
-    def add_route(
-        self, method: HTTPMethod, url_pattern: str, handler: Callable[..., Any]
-    ) -> None:
-        route = Route(method=method, url_pattern=url_pattern, handler=handler)
+    def add_route(  # noqa: PLR0913
+        self,
+        method: RouteMethod,
+        url_pattern: str,
+        handler: Callable[..., Any],
+        *,
+        middleware: Iterable[Middleware] = (),
+        skip_middleware: Iterable[Middleware] = (),
+        cache: Cache | None = None,
+        execution: Execution = "threadpool",
+        msgpack: bool = False,
+    ) -> Route:
+        if cache is not None and method not in _CACHEABLE_METHODS:
+            msg = f"Responses of {method} routes can't be cached, use GET or HEAD."
+            raise ValueError(msg)
+        route = Route(
+            method=method,
+            url_pattern=url_pattern,
+            handler=handler,
+            middleware=middleware,
+            skip_middleware=skip_middleware,
+            execution=execution,
+            executor=self.executor,
+            msgpack=msgpack,
+        )
+        if cache is not None:
+            route.cache = cache
+            route.invoke = cache.wrap(route, route.invoke, self.response_cache)
+        self.routes.append(route)
+        if method not in self._routers_by_method:
+            self._routers_by_method[method] = MatchitRouter()
         self._routers_by_method[method].insert(url_pattern, route)
+        if "{" not in url_pattern:
+            self._static_routes.setdefault(method, {})[url_pattern] = route
+        # Cached matches may be shadowed by the new route.
+        self._match_dynamic = self._build_dynamic_matcher()
+        return route
+
+    def invalidate_cache(
+        self,
+        handler: Callable[..., Any] | None = None,
+        params: Mapping[str, str] | None = None,
+    ) -> int:
+        """
+        Drop cached responses of the handler routes, all of them if it is None.
+
+        `params` limits invalidation to responses of matching path params.
+        Returns number of dropped responses.
+        """
+        if handler is None:
+            return self.response_cache.invalidate()
+        return sum(
+            self.response_cache.invalidate(route, params)
+            for route in self.routes
+            if route.handler is handler
+        )
+
+    def mount(self, prefix: str, router: "Router") -> None:
+        """
+        Add routes of the `router` under the `prefix` path.
+
+        Routes are registered in this router as if they were added to it
+        directly, so matching stays a single lookup however deep routers
+        are nested. They use the thread pool and response cache of this
+        router. The root route of `router` is served on the bare prefix.
+        Routes added to `router` after mounting are not mounted.
+        """
+        prefix = prefix.rstrip("/")
+        for route in router.routes:
+            url_pattern = route.url_pattern
+            if url_pattern == "/" and prefix:
+                url_pattern = ""
+            self.add_route(
+                route.method,
+                prefix + url_pattern,
+                route.handler,
+                middleware=route.middleware,
+                skip_middleware=route.skip_middleware,
+                cache=route.cache,
+                execution=route.execution,
+                msgpack=route.msgpack,
+            )
+
+    def mount_static(self, prefix: str, static_files: StaticFiles) -> None:
+        """Serve files indexed by `static_files` under the `prefix` path."""
+        url_pattern = f"{prefix.rstrip('/')}/{{*path}}"
+        for method in (HTTPMethod.GET, HTTPMethod.HEAD):
+            self.add_route(method, url_pattern=url_pattern, handler=static_files.serve)
 
     def match_route(
-        self, method: HTTPMethod, path: str
+        self, method: RouteMethod, path: str
     ) -> tuple[Route, Mapping[str, str]] | None:
+        static_routes = self._static_routes.get(method)
+        if static_routes is not None and (route := static_routes.get(path)):
+            return route, _NO_PARAMS
+        return self._match_dynamic(method, path)
+
+    def _build_dynamic_matcher(
+        self,
+    ) -> Callable[[RouteMethod, str], tuple[Route, Mapping[str, str]] | None]:
+        if self._match_cache_size > 0:
+            return lru_cache(maxsize=self._match_cache_size)(self._match_tree)
+        return self._match_tree
+
+    def _match_tree(
+        self, method: RouteMethod, path: str
+    ) -> tuple[Route, Mapping[str, str]] | None:
+        router = self._routers_by_method.get(method)
+        if router is None:
+            return None
         try:
-            res = self._routers_by_method[method].at(path)
+            res = router.at(path)
         except LookupError:
             return None
         return res.value, res.params
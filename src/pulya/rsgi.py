@@ -1,16 +1,27 @@
 from abc import ABC
 from asyncio import AbstractEventLoop
-from collections import defaultdict
 from collections.abc import AsyncIterator, Iterable, Iterator
 from http import HTTPMethod, HTTPStatus
-from typing import Literal, Protocol
+from typing import Literal, Protocol, cast
 
 import msgspec
 
 from pulya.application import AbstractApplication
 from pulya.headers import Headers
-from pulya.request import Request
-from pulya.responses import Response
+from pulya.request import BaseRequest, check_content_length, limit_body
+from pulya.responses import (
+    JSON_HEADERS,
+    MSGPACK_HEADERS,
+    TEXT_HEADERS,
+    FileResponse,
+    Response,
+    StreamingResponse,
+    render_response,
+    wants_msgpack,
+)
+from pulya.serialization import encode_json, encode_msgpack
+from pulya.tracing import HANDLER, SEND, SERIALIZE
+from pulya.websocket import WebSocket, WebSocketDisconnectError
 
 
 class _Headers(Protocol):
@@ -96,7 +107,7 @@ class HTTPProtocol(Protocol):
         """__call__ to receive the entire body in bytes format."""
         ...
 
-    async def __aiter__(self) -> AsyncIterator[bytes]:
+    def __aiter__(self) -> AsyncIterator[bytes]:
         """__aiter__ to receive the body in bytes chunks."""
         ...
 
@@ -142,7 +153,39 @@ class HTTPProtocol(Protocol):
         ...
 
 
-class RSGIRequest(Request):
+class WebsocketMessage(Protocol):
+    """RSGI websocket message interface."""
+
+    #: 0 for close, 1 for bytes and 2 for string messages
+    kind: int
+    data: bytes | str
+
+
+class WebsocketTransport(Protocol):
+    """RSGI websocket transport interface."""
+
+    async def receive(self) -> WebsocketMessage: ...
+    async def send_bytes(self, data: bytes) -> None: ...
+    async def send_str(self, data: str) -> None: ...
+
+
+class WebsocketProtocol(Protocol):
+    """RSGI websocket protocol interface."""
+
+    async def accept(self) -> WebsocketTransport:
+        """Accept the connection and return its transport."""
+        ...
+
+    def close(self, status: int | None) -> tuple[int, bool]:
+        """Close the connection with the status code."""
+        ...
+
+
+#: Kind of RSGI websocket messages sent when connection is closed.
+_WS_CLOSE_KIND = 0
+
+
+class RSGIRequest(BaseRequest):
     """
     RSGI request adapter.
 
@@ -151,7 +194,10 @@ class RSGIRequest(Request):
 
     __slots__ = ("_protocol", "_scope")
 
-    def __init__(self, scope: Scope, protocol: HTTPProtocol) -> None:
+    def __init__(
+        self, scope: Scope, protocol: HTTPProtocol, max_body_size: int | None = None
+    ) -> None:
+        super().__init__(max_body_size)
         self._scope = scope
         self._protocol = protocol
 
@@ -164,48 +210,190 @@ class RSGIRequest(Request):
         return self._scope.path
 
     @property
-    def headers(self) -> Headers:
+    def query_string(self) -> str:
+        return self._scope.query_string
+
+    def _make_headers(self) -> Headers:
+        return RSGIHeaders(self._scope.headers)
+
+    async def _read_content(self) -> bytes:
+        if self._max_body_size is None:
+            return await self._protocol()
+        if check_content_length(self.headers, self._max_body_size) is not None:
+            # Body is limited by the declared length, no need to count.
+            return await self._protocol()
+        return b"".join([chunk async for chunk in self.stream()])
+
+    def stream(self) -> AsyncIterator[bytes]:
+        if self._max_body_size is None:
+            return aiter(self._protocol)
+        check_content_length(self.headers, self._max_body_size)
+        return limit_body(aiter(self._protocol), self._max_body_size)
+
+
+class RSGIWebSocket(WebSocket):
+    """RSGI websocket adapter over granian's native websocket protocol."""
+
+    __slots__ = ("_protocol", "_scope", "_transport")
+
+    def __init__(self, scope: Scope, protocol: WebsocketProtocol) -> None:
+        super().__init__()
+        self._scope = scope
+        self._protocol = protocol
+        self._transport: WebsocketTransport | None = None
+
+    @property
+    def path(self) -> str:
+        return self._scope.path
+
+    @property
+    def query_string(self) -> str:
+        return self._scope.query_string
+
+    def _make_headers(self) -> Headers:
         return RSGIHeaders(self._scope.headers)
 
-    async def get_content(self) -> bytes:
-        return await self._protocol()
+    async def _accept(self) -> None:
+        self._transport = await self._protocol.accept()
+
+    async def _receive_message(self) -> bytes | str:
+        message = await self._get_transport().receive()
+        if message.kind == _WS_CLOSE_KIND:
+            self._closed = True
+            raise WebSocketDisconnectError
+        return message.data
+
+    async def _send_bytes(self, data: bytes) -> None:
+        await self._get_transport().send_bytes(data)
+
+    async def _send_str(self, data: str) -> None:
+        await self._get_transport().send_str(data)
+
+    async def _close(self, code: int) -> None:
+        self._protocol.close(code)
+
+    def _get_transport(self) -> WebsocketTransport:
+        if self._transport is None:  # pragma: no cover
+            msg = "WebSocket is not accepted"
+            raise RuntimeError(msg)
+        return self._transport
 
 
 class RSGIHeaders(Headers):
+    """
+    RSGI headers adapter.
+
+    Lazily reads values from the headers object provided by the server.
+    """
+
+    __slots__ = ["_raw"]
+
     def __init__(self, headers: _Headers | None = None) -> None:
-        self._headers = defaultdict(list)
-        if headers is not None:
-            for k in headers:
-                self.set_list(k, headers.get_all(k))
+        self._headers = {}
+        self._loaded = False
+        self._raw = headers
+
+    def _load(self, key: str) -> list[str]:
+        return self._raw.get_all(key) if self._raw is not None else []
+
+    def _native_items(self) -> Iterable[tuple[str, str]]:
+        return self._raw.items() if self._raw is not None else ()
+
+
+def _send_response(response: Response, protocol: HTTPProtocol) -> None:
+    """Send the body, with the default content-type unless the response has one."""
+    headers = response.headers
+    if not any(k == "content-type" for k, _ in headers):
+        headers = [*headers, ("content-type", response.default_content_type)]
+    protocol.response_bytes(
+        status=response.status, headers=headers, body=response.content
+    )
+
+
+async def _send_stream(response: StreamingResponse, protocol: HTTPProtocol) -> None:
+    transport = protocol.response_stream(
+        status=response.status, headers=response.headers
+    )
+    async for chunk in response.content:
+        if isinstance(chunk, str):
+            await transport.send_str(chunk)
+        else:
+            await transport.send_bytes(chunk)
+
+
+def _send_file(response: FileResponse, protocol: HTTPProtocol) -> None:
+    """Let the server send the file without reading it in python."""
+    if response.byte_range is None:
+        protocol.response_file(
+            status=response.status, headers=response.headers, file=response.path
+        )
+    else:
+        start, end = response.byte_range
+        protocol.response_file_range(
+            status=response.status,
+            headers=response.headers,
+            file=response.path,
+            start=start,
+            end=end,
+        )
 
 
 class RSGIApplication(AbstractApplication, ABC):
     """Pulya RSGI application interface implementation."""
 
-    async def __rsgi__(self, scope: Scope, protocol: HTTPProtocol) -> None:
-        if scope.proto != "http":  # pragma: no cover
-            msg = f"Unsupported protocol {scope.proto}"
-            raise RuntimeError(msg)
-
-        response = await self.handle_http_request(RSGIRequest(scope, protocol))
-
-        if isinstance(response, Response):
-            protocol.response_bytes(
-                status=response.status, headers=response.headers, body=response.content
+    async def __rsgi__(
+        self, scope: Scope, protocol: HTTPProtocol | WebsocketProtocol
+    ) -> None:
+        if scope.proto == "ws":
+            await self.handle_websocket(
+                RSGIWebSocket(scope, cast("WebsocketProtocol", protocol))
             )
-        elif isinstance(response, bytes):
-            protocol.response_bytes(status=HTTPStatus.OK, headers=[], body=response)
-        elif isinstance(response, str):
-            protocol.response_bytes(
-                status=HTTPStatus.OK, headers=[], body=response.encode()
+            return
+        # Handled inline, a nested coroutine would add a frame to every request.
+        protocol = cast("HTTPProtocol", protocol)
+        request = RSGIRequest(scope, protocol, self.max_body_size)
+        response = await self.handle_http_request(request)
+        route = request.route
+        content_headers = None if route is None else route.content_headers
+        trace = request.trace
+        if trace is not None:
+            trace.mark(HANDLER)
+            response = render_response(
+                response, content_headers, msgpack=wants_msgpack(request)
             )
-        elif isinstance(response, (msgspec.Struct, dict, list, str, int)):
+            trace.mark(SERIALIZE)
+
+        if isinstance(response, Response):
+            _send_response(response, protocol)
+        elif isinstance(response, StreamingResponse):
+            await _send_stream(response, protocol)
+        elif isinstance(response, FileResponse):
+            _send_file(response, protocol)
+        elif isinstance(response, str | bytes):
             protocol.response_bytes(
-                status=HTTPStatus.OK, headers=[], body=msgspec.json.encode(response)
+                status=HTTPStatus.OK,
+                headers=(content_headers or TEXT_HEADERS).rsgi,
+                body=response.encode() if isinstance(response, str) else response,
             )
+        elif isinstance(response, (msgspec.Struct, dict, list, int)):
+            if wants_msgpack(request):
+                protocol.response_bytes(
+                    status=HTTPStatus.OK,
+                    headers=MSGPACK_HEADERS.rsgi,
+                    body=encode_msgpack(response),
+                )
+            else:
+                protocol.response_bytes(
+                    status=HTTPStatus.OK,
+                    headers=(content_headers or JSON_HEADERS).rsgi,
+                    body=encode_json(response),
+                )
         else:  # pragma: no cover
             msg = f"Unsupported response type {type(response)}"
             raise TypeError(msg)
+        if trace is not None:
+            trace.mark(SEND)
+            trace.finish()
 
     def __rsgi_init__(self, loop: AbstractEventLoop) -> None:
         loop.run_until_complete(self.on_startup())
@@ -0,0 +1,108 @@
+import threading
+from typing import Any
+
+import msgspec
+
+
+class _Encoders(threading.local):
+    """
+    Long-lived msgspec encoders.
+
+    Encoders are kept per thread, so that free-threaded builds never share
+    encoder state between threads.
+    """
+
+    def __init__(self) -> None:
+        self.json = msgspec.json.Encoder()
+        self.msgpack = msgspec.msgpack.Encoder()
+
+
+_encoders = _Encoders()
+
+
+def encode_json(obj: Any) -> bytes:
+    """Serialize response object to JSON using the thread's encoder."""
+    return _encoders.json.encode(obj)
+
+
+def encode_msgpack(obj: Any) -> bytes:
+    """Serialize object to MessagePack using the thread's encoder."""
+    return _encoders.msgpack.encode(obj)
+
+
+#: Media types of MessagePack content, the first one is used in responses.
+MSGPACK_MEDIA_TYPES = (
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+)
+
+_JSON_MEDIA_RANGES = frozenset({"application/json", "application/*", "*/*"})
+
+
+def is_msgpack(content_type: str | None) -> bool:
+    """Check `Content-Type` header value is a MessagePack media type."""
+    if content_type is None:
+        return False
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type in MSGPACK_MEDIA_TYPES
+
+
+def prefers_msgpack(accept: str | None) -> bool:
+    """
+    Check `Accept` header value prefers MessagePack to JSON.
+
+    JSON wins ties, so it stays the default for clients accepting both.
+    """
+    if accept is None or "msgpack" not in accept:
+        return False
+    msgpack_q = json_q = 0.0
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in _JSON_MEDIA_RANGES:
+            json_q = max(json_q, q)
+    return msgpack_q > json_q
+
+
+class Decoders[M]:
+    """JSON and MessagePack decoders of a schema."""
+
+    __slots__ = ("json", "msgpack", "schema")
+
+    def __init__(self, schema: type[M]) -> None:
+        self.schema = schema
+        self.json = msgspec.json.Decoder(schema)
+        self.msgpack = msgspec.msgpack.Decoder(schema)
+
+
+#: Decoders by schema, decoders are safe to share between threads.
+_decoders: dict[Any, Decoders[Any]] = {}
+
+
+def get_decoders[M](schema: type[M]) -> Decoders[M]:
+    """Decoders of the schema, built once per schema."""
+    decoders = _decoders.get(schema)
+    if decoders is None:
+        decoders = _decoders[schema] = Decoders(schema)
+    return decoders
+
+
+def decode_json[M](data: bytes | str, schema: type[M]) -> M:
+    """Deserialize JSON as `schema` using decoder built once per schema."""
+    return get_decoders(schema).json.decode(data)
+
+
+def decode_msgpack[M](data: bytes, schema: type[M]) -> M:
+    """Deserialize MessagePack as `schema` using decoder built once per schema."""
+    return get_decoders(schema).msgpack.decode(data)
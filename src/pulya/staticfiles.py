@@ -0,0 +1,182 @@
+import mimetypes
+import os
+from email.utils import formatdate
+from http import HTTPStatus
+from pathlib import Path
+
+import msgspec
+
+from pulya.request import Request
+from pulya.responses import BaseResponse, FileResponse, Response
+
+_NOT_FOUND_CONTENT = msgspec.json.encode({"error": "Not found."})
+
+#: Precompressed sibling suffixes by content-encoding, in preference order.
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+_Headers = tuple[tuple[str, str], ...]
+
+
+class StaticFile:
+    """
+    Indexed static file.
+
+    Holds everything needed to answer a request for the file,
+    so serving it never touches the filesystem from python.
+    """
+
+    __slots__ = ["encoded", "etag", "headers", "path", "size"]
+
+    def __init__(self, path: Path, stat: os.stat_result) -> None:
+        self.path = str(path)
+        self.size = stat.st_size
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        content_type, _ = mimetypes.guess_type(path.name)
+        #: Response headers, copied per response so middleware can't alter them.
+        self.headers: _Headers = (
+            ("content-type", content_type or "application/octet-stream"),
+            ("content-length", str(self.size)),
+            ("etag", self.etag),
+            ("last-modified", formatdate(stat.st_mtime, usegmt=True)),
+            ("accept-ranges", "bytes"),
+        )
+        #: Precompressed variants: content-encoding -> (path, headers).
+        self.encoded: dict[str, tuple[str, _Headers]] = {}
+
+    def add_encoded(self, encoding: str, path: Path, stat: os.stat_result) -> None:
+        headers = tuple(
+            (k, str(stat.st_size) if k == "content-length" else v)
+            for k, v in self.headers
+        )
+        headers += (("content-encoding", encoding), ("vary", "accept-encoding"))
+        self.encoded[encoding] = (str(path), headers)
+
+    def range_response(self, range_header: str) -> BaseResponse:
+        """Build response for a `Range` request header."""
+        byte_range = parse_range(range_header, self.size)
+        if byte_range is None:
+            # Multiple ranges are not supported, respond with the whole file.
+            return FileResponse(self.path, headers=list(self.headers))
+        start, end = byte_range
+        if start >= end:
+            return Response(
+                content=b"",
+                status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers=[("content-range", f"bytes */{self.size}")],
+            )
+        headers = [
+            (k, str(end - start) if k == "content-length" else v)
+            for k, v in self.headers
+        ]
+        headers.append(("content-range", f"bytes {start}-{end - 1}/{self.size}"))
+        return FileResponse(
+            self.path,
+            status=HTTPStatus.PARTIAL_CONTENT,
+            headers=headers,
+            byte_range=(start, end),
+        )
+
+
+def parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse single `bytes` range into `[start, end)` offsets.
+
+    Returns None for headers which should be ignored (unknown units
+    or multiple ranges) and an empty range for unsatisfiable ones.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in ranges:
+        return None
+    first, _, last = ranges.strip().partition("-")
+    try:
+        if not first:
+            start, end = max(size - int(last), 0), size
+        else:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+    except ValueError:
+        return 0, 0
+    if start >= size:
+        return 0, 0
+    return start, end
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Parse `Accept-Encoding` header skipping explicitly refused encodings."""
+    encodings = set()
+    for item in accept_encoding.split(","):
+        encoding, _, params = item.partition(";")
+        if params.replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        encodings.add(encoding.strip().lower())
+    return encodings
+
+
+class StaticFiles:
+    """
+    Static files served from a directory.
+
+    The directory is indexed once on creation (see :py:meth:`refresh`),
+    requests are answered from the index with zero-copy file responses.
+    `.br` and `.gz` siblings are served as precompressed variants of files
+    when the client accepts the encoding.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = Path(directory).resolve()
+        self.index: dict[str, StaticFile] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuild the index of files found in the directory."""
+        found = {
+            path.relative_to(self.directory).as_posix(): path
+            for path in self.directory.rglob("*")
+            if path.is_file()
+        }
+        index = {
+            name: StaticFile(path, path.stat())
+            for name, path in found.items()
+            if not any(
+                name.endswith(suffix) and name.removesuffix(suffix) in found
+                for suffix in PRECOMPRESSED_SUFFIXES.values()
+            )
+        }
+        for name, file in index.items():
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+                if (path := found.get(name + suffix)) is not None:
+                    file.add_encoded(encoding, path, path.stat())
+        self.index = index
+
+    async def serve(self, request: Request, path: str) -> BaseResponse:
+        """Route handler answering GET and HEAD requests."""
+        file = self.index.get(path)
+        if file is None:
+            return Response(
+                content=_NOT_FOUND_CONTENT,
+                status=HTTPStatus.NOT_FOUND,
+                headers=[("content-type", "application/json")],
+            )
+
+        headers = request.headers
+        if_none_match = headers.get_first("if-none-match")
+        if if_none_match is not None and (
+            if_none_match.strip() == "*" or file.etag in if_none_match
+        ):
+            return Response(
+                content=b"",
+                status=HTTPStatus.NOT_MODIFIED,
+                headers=[("etag", file.etag)],
+            )
+
+        range_header = headers.get_first("range")
+        if range_header is not None:
+            return file.range_response(range_header)
+
+        if file.encoded and (accept_encoding := headers.get_first("accept-encoding")):
+            accepted = accepted_encodings(accept_encoding)
+            for encoding, (encoded_path, encoded_headers) in file.encoded.items():
+                if encoding in accepted:
+                    return FileResponse(encoded_path, headers=list(encoded_headers))
+
+        return FileResponse(file.path, headers=list(file.headers))
@@ -2,7 +2,6 @@ from asyncio import Queue, Task, get_running_loop
 from types import TracebackType
 from typing import Any, Self
 
-import httpx
 from asgiref.typing import (
     ASGI3Application,
     ASGIReceiveEvent,
@@ -13,6 +12,12 @@ from asgiref.typing import (
     LifespanStartupEvent,
 )
 
+try:
+    import httpx
+except ImportError as e:  # pragma: no cover
+    msg = "TestClient requires httpx, install it with `pip install pulya[testing]`."
+    raise ImportError(msg) from e
+
 
 async def _lifespan_task(
     app: ASGI3Application,
@@ -0,0 +1,129 @@
+import itertools
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from typing import IO, TYPE_CHECKING, Any, Protocol
+
+import msgspec
+
+if TYPE_CHECKING:
+    from pulya.request import Request
+
+#: Stages of the request path, in order. Each stage ends at its mark.
+MATCH = "match"
+CONVERT = "convert"
+INJECT = "inject"
+HANDLER = "handler"
+SERIALIZE = "serialize"
+SEND = "send"
+
+
+class TraceSink(Protocol):
+    """Receiver of finished traces."""
+
+    def record(self, trace: "Trace") -> None: ...
+
+
+class Trace:
+    """
+    Monotonic timestamps of request stages.
+
+    Stage starts where the previous one (or the trace) ends, so
+    :py:meth:`stages` have no gaps. Routes with middleware or response cache
+    have no `convert` and `inject` stages, they are a part of `handler`.
+    """
+
+    __slots__ = ("marks", "method", "path", "route", "sink", "start")
+
+    def __init__(self, sink: TraceSink, method: str, path: str) -> None:
+        self.sink = sink
+        self.method = method
+        self.path = path
+        #: Url pattern of the matched route, None if nothing matched.
+        self.route: str | None = None
+        self.start = time.perf_counter_ns()
+        self.marks: list[tuple[str, int]] = []
+
+    def mark(self, stage: str) -> None:
+        """Record the end of the stage."""
+        self.marks.append((stage, time.perf_counter_ns()))
+
+    def finish(self) -> None:
+        self.sink.record(self)
+
+    def stages(self) -> list[tuple[str, int, int]]:
+        """Stages as `(stage, start, end)` nanosecond timestamps."""
+        starts = [self.start, *(ts for _, ts in self.marks)]
+        return [
+            (stage, start, end)
+            for start, (stage, end) in zip(starts, self.marks, strict=False)
+        ]
+
+    def to_span(self) -> dict[str, Any]:
+        """Trace as a span with a child span per stage."""
+        end = self.marks[-1][1] if self.marks else self.start
+        return {
+            "name": f"{self.method} {self.route or self.path}",
+            "path": self.path,
+            "start_ns": self.start,
+            "duration_ns": end - self.start,
+            "spans": [
+                {"name": stage, "start_ns": start, "duration_ns": end - start}
+                for stage, start, end in self.stages()
+            ],
+        }
+
+
+class Tracer:
+    """Starts traces of every `sample_every` request, others cost nothing."""
+
+    __slots__ = ("_counter", "sample_every", "sink")
+
+    def __init__(self, sink: TraceSink, *, sample_every: int = 1) -> None:
+        self.sink = sink
+        self.sample_every = sample_every
+        self._counter = itertools.count()
+
+    def start(self, request: "Request") -> Trace | None:
+        if next(self._counter) % self.sample_every:
+            return None
+        return Trace(self.sink, request.method, request.path)
+
+
+class RingBuffer:
+    """In-memory sink keeping the last `capacity` traces."""
+
+    __slots__ = ("traces",)
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.traces: deque[Trace] = deque(maxlen=capacity)
+
+    def __iter__(self) -> Iterator[Trace]:
+        return iter(self.traces.copy())
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    def record(self, trace: Trace) -> None:
+        self.traces.append(trace)
+
+
+class SpanExporter:
+    """
+    Sink writing traces as JSON lines of spans (see :py:meth:`Trace.to_span`).
+
+    The output is meant for offline analysis, e.g. loading into a dataframe.
+    """
+
+    __slots__ = ("_encoder", "_lock", "stream")
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        self.stream = stream
+        self._encoder = msgspec.json.Encoder()
+        self._lock = threading.Lock()
+
+    def record(self, trace: Trace) -> None:
+        line = self._encoder.encode(trace.to_span()) + b"\n"
+        with self._lock:
+            self.stream.write(line)
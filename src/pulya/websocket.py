@@ -0,0 +1,121 @@
+from collections.abc import AsyncIterator
+from http import HTTPMethod
+from typing import Any
+
+from pulya.request import BaseRequest
+from pulya.serialization import (
+    decode_json,
+    decode_msgpack,
+    encode_json,
+    encode_msgpack,
+)
+
+#: Close code of a normally finished connection.
+NORMAL_CLOSURE = 1000
+#: Close code of connections rejected by the application.
+POLICY_VIOLATION = 1008
+
+
+class WebSocketDisconnectError(Exception):
+    """WebSocket connection is closed by the client."""
+
+    def __init__(self, code: int = NORMAL_CLOSURE) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+class WebSocket(BaseRequest):
+    """
+    WebSocket connection.
+
+    Handshake of the connection is exposed as a request without body, so
+    headers, query and path params are injected into websocket handlers
+    the same way as into HTTP ones. Messages are sent and received either
+    raw or encoded with msgspec: JSON in text frames, MessagePack in binary.
+    """
+
+    __slots__ = ("_accepted", "_closed")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._accepted = False
+        self._closed = False
+
+    @property
+    def method(self) -> HTTPMethod:
+        return HTTPMethod.GET
+
+    async def accept(self) -> None:
+        """Accept the connection, called implicitly by the first send/receive."""
+        if not self._accepted:
+            self._accepted = True
+            await self._accept()
+
+    async def receive(self) -> bytes | str:
+        """Receive message, raises :py:exc:`WebSocketDisconnectError` on close."""
+        await self.accept()
+        return await self._receive_message()
+
+    async def receive_bytes(self) -> bytes:
+        message = await self.receive()
+        return message.encode() if isinstance(message, str) else message
+
+    async def receive_json[M](self, schema: type[M]) -> M:
+        """Receive JSON message decoded as `schema`."""
+        return decode_json(await self.receive(), schema)
+
+    async def receive_msgpack[M](self, schema: type[M]) -> M:
+        """Receive MessagePack message decoded as `schema`."""
+        return decode_msgpack(await self.receive_bytes(), schema)
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.accept()
+        await self._send_bytes(data)
+
+    async def send_str(self, data: str) -> None:
+        await self.accept()
+        await self._send_str(data)
+
+    async def send_json(self, obj: Any) -> None:
+        """Send object encoded to JSON in a text frame."""
+        await self.send_str(encode_json(obj).decode())
+
+    async def send_msgpack(self, obj: Any) -> None:
+        """Send object encoded to MessagePack in a binary frame."""
+        await self.send_bytes(encode_msgpack(obj))
+
+    async def close(self, code: int = NORMAL_CLOSURE) -> None:
+        """Close the connection, rejects it if it is not accepted yet."""
+        if not self._closed:
+            self._closed = True
+            await self._close(code)
+
+    async def __aiter__(self) -> AsyncIterator[bytes | str]:
+        """Iterate over received messages until the client disconnects."""
+        try:
+            while True:
+                yield await self.receive()
+        except WebSocketDisconnectError:
+            self._closed = True
+
+    async def _read_content(self) -> bytes:
+        return b""
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        return
+        yield
+
+    async def _accept(self) -> None:
+        raise NotImplementedError
+
+    async def _receive_message(self) -> bytes | str:
+        raise NotImplementedError
+
+    async def _send_bytes(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    async def _send_str(self, data: str) -> None:
+        raise NotImplementedError
+
+    async def _close(self, code: int) -> None:
+        raise NotImplementedError
@@ -0,0 +1,87 @@
+import importlib
+import inspect
+import pkgutil
+from collections.abc import Iterable, Iterator
+from types import ModuleType
+from typing import Any, get_args
+
+from dependency_injector.containers import Container
+from dependency_injector.wiring import _is_marker, _patched_registry
+
+
+def _has_marker(value: Any) -> bool:
+    """Whether `value` is a marker or an `Annotated` hint carrying one."""
+    return _is_marker(value) or any(map(_is_marker, get_args(value)))
+
+
+def _has_marked_params(value: Any) -> bool:
+    func = getattr(value, "__func__", value)
+    if not inspect.isfunction(func):
+        return False
+    defaults = [*(func.__defaults__ or ()), *(func.__kwdefaults__ or {}).values()]
+    return any(map(_has_marker, defaults)) or any(
+        map(_has_marker, func.__annotations__.values())
+    )
+
+
+def _has_markers(obj: ModuleType | type) -> bool:
+    """
+    Whether wiring would patch any member of a module or a class.
+
+    Checks the same members as dependency-injector does, but reads function
+    defaults and annotations directly instead of building their signatures.
+    """
+    if any(map(_has_marker, inspect.get_annotations(obj).values())):
+        return True
+    namespaces = [vars(obj)] if isinstance(obj, ModuleType) else map(vars, obj.__mro__)
+    return any(
+        _has_marker(value)
+        or _has_marked_params(value)
+        or (
+            isinstance(obj, ModuleType)
+            and inspect.isclass(value)
+            and _has_markers(value)
+        )
+        for namespace in namespaces
+        for value in namespace.values()
+    )
+
+
+def uses_markers(module: ModuleType) -> bool:
+    """Whether wiring the module would patch anything in it."""
+    if next(_patched_registry.get_callables_from_module(module), None) is not None:
+        return True
+    return _has_markers(module)
+
+
+def _import(
+    modules: Iterable[ModuleType | str], package: str | None
+) -> Iterator[ModuleType]:
+    for module in modules:
+        if isinstance(module, str):
+            yield importlib.import_module(module, package)
+        else:
+            yield module
+
+
+def wired_modules(container: Container) -> list[ModuleType]:
+    """
+    Modules of container `wiring_config` which use markers.
+
+    Packages are expanded into all of their modules, relative names are
+    resolved against `from_package` or the package of the container class.
+    """
+    config = container.wiring_config
+    package = config.from_package
+    if package is None:
+        container_class = container.declarative_parent or type(container)
+        package = importlib.import_module(container_class.__module__).__package__
+    modules = list(_import(config.modules, package))
+    for root in _import(config.packages, package):
+        modules.append(root)
+        if hasattr(root, "__path__"):
+            modules += [
+                importlib.import_module(info.name)
+                for info in pkgutil.walk_packages(root.__path__, root.__name__ + ".")
+            ]
+    return [module for module in modules if uses_markers(module)]
@@ -0,0 +1,127 @@
+from collections.abc import AsyncGenerator
+from http import HTTPMethod, HTTPStatus
+from typing import Annotated, Any
+
+import pytest
+from dependency_injector import containers, providers
+
+from pulya import Header, Pulya, RequestContainer, Router, TestClient
+from pulya.cache import Cache, CacheStore
+from pulya.responses import Response
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+app = Pulya(Container)
+calls: list[str] = []
+
+
+@app.get("/items/{item_id}", cache=Cache(60, query=["page"], headers=["X-Lang"]))
+async def item(
+    item_id: str,
+    lang: Annotated[str | None, Header("x-lang")],
+    page: int = 1,
+    other: str = "",
+) -> dict[str, Any]:
+    calls.append(item_id)
+    return {"item_id": item_id, "page": page, "lang": lang, "other": other}
+
+
+@app.get("/missing", cache=Cache(60))
+async def missing() -> Response:
+    calls.append("missing")
+    return Response(b"", status=HTTPStatus.NOT_FOUND)
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    calls.clear()
+    app.invalidate_cache()
+    async with TestClient(app=app) as client:
+        yield client
+
+
+async def test_cached_by_key(client: TestClient) -> None:
+    first = await client.get("/items/1?page=2&other=a")
+    again = await client.get("/items/1?other=b&page=2")
+    assert (
+        first.json()
+        == again.json()
+        == {
+            "item_id": "1",
+            "page": 2,
+            "lang": None,
+            "other": "a",
+        }
+    )
+    await client.get("/items/1?page=3")
+    await client.get("/items/1?page=2", headers={"x-lang": "en"})
+    await client.get("/items/2?page=2")
+    assert calls == ["1", "1", "1", "2"]
+
+
+async def test_errors_not_cached(client: TestClient) -> None:
+    await client.get("/missing")
+    await client.get("/missing")
+    assert calls == ["missing", "missing"]
+
+
+async def test_invalidate(client: TestClient) -> None:
+    await client.get("/items/1")
+    await client.get("/items/2")
+    assert app.invalidate_cache(item, {"item_id": "1"}) == 1
+    assert app.invalidate_cache(missing) == 0
+    await client.get("/items/1")
+    await client.get("/items/2")
+    assert calls == ["1", "2", "1"]
+    assert app.invalidate_cache() == 2  # noqa: PLR2004
+    assert app.response_cache.size == 0
+
+
+@pytest.mark.parametrize("method", [HTTPMethod.POST, HTTPMethod.DELETE])
+def test_unsafe_methods_not_cached(method: HTTPMethod) -> None:
+    router = Router()
+    with pytest.raises(ValueError, match=f"{method} routes can't be cached"):
+        router.add_route(method, "/orders", missing, cache=Cache(60))
+    assert router.routes == []
+    router.add_route(HTTPMethod.HEAD, "/orders", missing, cache=Cache(60))
+
+
+def test_store_ttl_and_budget() -> None:
+    now = 0.0
+    store = CacheStore(max_bytes=10, clock=lambda: now)
+    store.set("a", Response(b"1234"), ttl=10)
+    store.set("a", Response(b"1234"), ttl=10)
+    store.set("b", Response(b"1234"), ttl=5)
+    assert store.size == 8  # noqa: PLR2004
+    assert store.get("a") is not None
+
+    # Least recently used entry is evicted
+    store.set("c", Response(b"1234"), ttl=20)
+    assert store.get("b") is None
+    assert len(store) == 2  # noqa: PLR2004
+
+    store.set("big", Response(b"12345678901"), ttl=10)
+    assert store.get("big") is None
+
+    now = 10
+    assert store.get("a") is None
+    assert store.get("c") is not None
+    assert store.size == 4  # noqa: PLR2004
+
+
+def test_store_serves_copies() -> None:
+    store = CacheStore()
+    response = Response(b"body", headers=[("content-type", "text/plain")])
+    store.set("a", response, ttl=10)
+    response.headers.append(("x-late", "1"))
+    size = store.size
+
+    for _ in range(3):
+        cached = store.get("a")
+        assert cached is not None
+        assert cached.headers == [("content-type", "text/plain")]
+        cached.headers.append(("x-req", "1"))
+    assert store.size == size
@@ -0,0 +1,152 @@
+import gzip
+import os
+import zlib
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import msgspec
+import pytest
+from dependency_injector import containers, providers
+
+from pulya import Pulya, RequestContainer, TestClient
+from pulya.compression import CODECS, Compression
+from pulya.responses import Response, StreamingResponse
+
+PAYLOAD = {"items": ["item"] * 100}
+NUMBERS = [1] * 1000
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+compression = Compression(minimum_size=100, offload_size=1000, level=5)
+app = Pulya(Container)
+app.add_middleware(compression)
+
+
+@app.get("/items")
+async def items() -> dict[str, list[str]]:
+    return PAYLOAD
+
+
+@app.get("/large")
+async def large() -> str:
+    return "x" * 2000
+
+
+@app.get("/small")
+async def small() -> str:
+    return "small"
+
+
+@app.get("/raw", skip_middleware=[compression])
+async def raw() -> str:
+    return "x" * 2000
+
+
+@app.get("/bytes")
+async def bytes_response() -> bytes:
+    return b"x" * 2000
+
+
+@app.get("/json")
+async def json_response() -> Response:
+    return Response(
+        msgspec.json.encode(NUMBERS),
+        headers=[("content-type", "application/json"), ("content-length", "2001")],
+    )
+
+
+@app.get("/plain")
+async def plain() -> Response:
+    return Response(b"x" * 2000)
+
+
+RANDOM = os.urandom(2000)
+
+
+@app.get("/encoded")
+async def encoded() -> Response:
+    return Response(gzip.compress(RANDOM), headers=[("content-encoding", "gzip")])
+
+
+async def _chunks() -> AsyncGenerator[bytes, Any]:
+    yield b"x" * 2000
+
+
+@app.get("/stream")
+async def stream() -> StreamingResponse:
+    return StreamingResponse(_chunks())
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    async with TestClient(app=app, headers={"accept-encoding": "gzip"}) as client:
+        yield client
+
+
+async def test_compressed(client: TestClient) -> None:
+    resp = await client.get("/items")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "accept-encoding"
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == PAYLOAD
+
+    # Compressed in a thread.
+    resp = await client.get("/large")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.text == "x" * 2000
+
+    resp = await client.get("/bytes")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"] == "text/plain"
+
+    resp = await client.get("/plain")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"] == "text/plain"
+
+    resp = await client.get("/json")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == NUMBERS
+
+
+@pytest.mark.parametrize("path", ["/small", "/raw", "/stream"])
+async def test_not_compressed(client: TestClient, path: str) -> None:
+    resp = await client.get(path)
+    assert "content-encoding" not in resp.headers
+
+
+async def test_already_encoded(client: TestClient) -> None:
+    resp = await client.get("/encoded")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "vary" not in resp.headers
+    assert resp.content == RANDOM
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [("identity", None), ("", None), ("deflate, gzip;q=0", "deflate")],
+)
+async def test_negotiation(
+    client: TestClient, accept_encoding: str, expected: str | None
+) -> None:
+    resp = await client.get("/large", headers={"accept-encoding": accept_encoding})
+    assert resp.headers.get("content-encoding") == expected
+    assert resp.text == "x" * 2000
+
+
+def test_codecs() -> None:
+    data = b"x" * 1000
+    assert gzip.decompress(CODECS["gzip"](data, None)) == data
+    assert zlib.decompress(CODECS["deflate"](data, 1)) == data
+    assert Compression(encodings=["deflate", "unknown"]).codecs == {
+        "deflate": CODECS["deflate"]
+    }
+
+
+def test_zstd_codec() -> None:
+    pytest.importorskip("zstandard")
+    data = b"x" * 1000
+    assert len(CODECS["zstd"](data, None)) < len(data)
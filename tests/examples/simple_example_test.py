@@ -9,6 +9,7 @@ from asgiref.typing import (
 
 from examples.simple_example import app as simple_app
 from pulya import TestClient
+from tests.websocket_test import DISCONNECT, asgi_session, bytes_event, text_event
 
 
 @pytest.fixture
@@ -30,6 +31,7 @@ async def test_unknown_route(client: TestClient) -> None:
 async def test_simple(client: TestClient) -> None:
     resp = await client.get("/")
     assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["content-type"] == "application/json"
     assert resp.json() == {"success": True}
 
 
@@ -78,3 +80,42 @@ async def test_str_response(client: TestClient) -> None:
     resp = await client.get("/str/")
     assert resp.status_code == HTTPStatus.OK
     assert resp.content == b"Hello in plain text!"
+    assert resp.headers["content-type"] == "text/plain"
+
+
+async def test_stream_response(client: TestClient) -> None:
+    resp = await client.get("/stream/")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.content == b"Hello in chunks!"
+
+
+async def test_typed_path_params(client: TestClient) -> None:
+    resp = await client.get("/items/42")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json() == {"item_id": 42}
+
+
+async def test_query_params(client: TestClient) -> None:
+    resp = await client.get("/search/books?q=python&p=2&tags=a&tags=b")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json() == {
+        "category": "books",
+        "q": "python",
+        "page": 2,
+        "tags": ["a", "b"],
+    }
+
+    resp = await client.get("/search/books", params={"q": "python"})
+    assert resp.json() == {"category": "books", "q": "python", "page": 1, "tags": None}
+
+
+async def test_websocket() -> None:
+    sent = await asgi_session(
+        "/ws/news",
+        [text_event("hi"), bytes_event(b"there"), DISCONNECT],
+        asgi_app=simple_app,
+    )
+    assert [event.get("text") for event in sent[1:]] == [
+        '{"room":"news","text":"hi"}',
+        '{"room":"news","text":"there"}',
+    ]
@@ -1,8 +1,9 @@
 import pytest
 
-from pulya.asgi import ASGIHeaders
+from pulya.asgi import ASGIHeaders, ASGIRequest
 from pulya.headers import Headers, ManyStrategy, TooManyHeadersError
 from pulya.rsgi import RSGIHeaders
+from tests.rsgi_test import StubHeaders
 
 test_header = "X-Test-Header"
 expected_value = "expected_VALUE"
@@ -42,3 +43,48 @@ def test_simple(headers: Headers) -> None:
 
     headers.set_list(test_header, [expected_value, new_value])
     assert headers.get_list(test_header) == [expected_value, new_value]
+    assert list(headers) == [
+        (test_header.lower(), expected_value),
+        (test_header.lower(), new_value),
+    ]
+
+
+def test_iteration_keeps_native_order() -> None:
+    asgi_headers = ASGIHeaders(
+        [(b"x-a", b"1"), (b"x-b", b"2"), (b"x-a", b"3"), (b"x-c", b"4")]
+    )
+    rsgi_headers = RSGIHeaders(StubHeaders({"x-a": "1", "x-b": "2", "x-c": "4"}))
+    for headers in (asgi_headers, rsgi_headers):
+        assert headers.get_first("X-A") == "1"
+        headers.set("x-b", "changed")
+        headers.add("x-d", "5")
+        assert headers.get("x-missing") is None
+
+        assert dict(headers) == {
+            "x-a": headers.get_last("x-a"),
+            "x-b": "changed",
+            "x-c": "4",
+            "x-d": "5",
+        }
+
+    assert (
+        list(asgi_headers)
+        == list(asgi_headers)
+        == [
+            ("x-a", "1"),
+            ("x-a", "3"),
+            ("x-b", "changed"),
+            ("x-c", "4"),
+            ("x-d", "5"),
+        ]
+    )
+    assert rsgi_headers.get_list("x-missing") == []
+
+
+def test_request_headers_built_once() -> None:
+    request = ASGIRequest(
+        {"headers": [(b"x-a", b"1")]},  # type: ignore[typeddict-item]
+        None,  # type: ignore[arg-type]
+    )
+    assert request.headers is request.headers
+    assert request.headers["x-a"] == "1"
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+import pulya
+
+#: Budget of the time spent running pulya's own modules on import, in
+#: microseconds. Dependencies, mostly dependency-injector, are excluded:
+#: pulya modules take about 30 ms of the 200 ms `import pulya`, the budget
+#: leaves room for slow and free-threaded CI runners.
+IMPORT_BUDGET_US = 150_000
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Import times of modules imported by the statement, without nested imports."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        own, _, name = line.split("|")
+        own = own.rpartition(":")[2]
+        if own.strip().isdigit():
+            times[name.strip()] = int(own)
+    return times
+
+
+def test_import_time() -> None:
+    times = _import_times("import pulya")
+    own = sum(
+        time
+        for name, time in times.items()
+        if name == "pulya" or name.startswith("pulya.")
+    )
+    assert own < IMPORT_BUDGET_US
+    assert "httpx" not in times
+    assert "pulya.testing" not in times
+
+
+def test_lazy_test_client() -> None:
+    times = _import_times("from pulya import TestClient")
+    assert "httpx" in times
+    assert pulya.TestClient is pulya.testing.TestClient
+
+
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        _ = pulya.Missing
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from collections.abc import AsyncGenerator
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from dependency_injector import containers, providers
+
+from pulya import Pulya, RequestContainer, TestClient
+from pulya.metrics import Metrics
+from pulya.responses import Response
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+app = Pulya(Container, metrics=Metrics(buckets=[1.0, 0.1]))
+app.mount_metrics()
+
+
+@app.get("/items/{item_id}")
+async def item(item_id: int) -> dict[str, int]:
+    return {"item_id": item_id}
+
+
+@app.get("/teapot")
+async def teapot() -> Response:
+    return Response(content=b"", status=HTTPStatus.IM_A_TEAPOT)
+
+
+@app.get("/error")
+async def error() -> None:
+    raise RuntimeError
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    async with TestClient(app=app) as client:
+        yield client
+
+
+async def test_metrics_exposition(client: TestClient) -> None:
+    await client.get("/items/1")
+    await client.get("/items/2")
+    await client.get("/teapot")
+    await client.get("/missing")
+    with pytest.raises(RuntimeError):
+        await client.get("/error")
+
+    resp = await client.get("/metrics")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = resp.text.splitlines()
+    assert 'pulya_requests_total{route="/items/{item_id}",status="200"} 2' in lines
+    assert 'pulya_requests_total{route="/teapot",status="418"} 1' in lines
+    assert 'pulya_requests_total{route="/error",status="500"} 1' in lines
+    assert 'pulya_requests_total{route="<unmatched>",status="404"} 1' in lines
+    assert (
+        'pulya_request_duration_seconds_bucket{route="/items/{item_id}",le="+Inf"} 2'
+        in lines
+    )
+    assert 'pulya_request_duration_seconds_count{route="/teapot"} 1' in lines
+    # The metrics request itself is being handled.
+    assert 'pulya_requests_in_flight{route="/metrics"} 1' in lines
+    assert "pulya_executor_pending 0" in lines
+
+
+async def test_metrics_threads_are_merged() -> None:
+    metrics = Metrics(buckets=[0.1])
+
+    async def ok() -> str:
+        return "ok"
+
+    def measure() -> None:
+        asyncio.run(metrics.measure("/", ok()))
+
+    threads = [threading.Thread(target=measure) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    await metrics.measure("/", ok())
+
+    lines = metrics.render().splitlines()
+    assert 'pulya_requests_total{route="/",status="200"} 4' in lines
+    assert 'pulya_request_duration_seconds_bucket{route="/",le="0.1"} 4' in lines
+
+
+def test_mount_metrics_requires_metrics() -> None:
+    with pytest.raises(RuntimeError, match="not enabled"):
+        Pulya(Container).mount_metrics()
@@ -0,0 +1,112 @@
+from collections.abc import AsyncGenerator
+from http import HTTPMethod, HTTPStatus
+from typing import Any
+
+import pytest
+from dependency_injector import containers, providers
+
+from pulya import Pulya, RequestContainer, Router, TestClient
+from pulya.middleware import CallNext
+from pulya.request import Request
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+calls: list[str] = []
+
+
+async def record(request: Request, call_next: CallNext) -> Any:
+    calls.append(f"record {request.path} {dict(request.path_params)}")
+    return await call_next(request)
+
+
+async def outer(request: Request, call_next: CallNext) -> Any:
+    calls.append("outer")
+    return await call_next(request)
+
+
+async def only_here(request: Request, call_next: CallNext) -> Any:
+    calls.append("only_here")
+    return await call_next(request)
+
+
+app = Pulya(Container)
+app.add_middleware(outer)
+app.add_middleware(record)
+
+
+@app.get("/items/{item_id}", middleware=[only_here])
+async def item(item_id: int) -> dict[str, int]:
+    return {"item_id": item_id}
+
+
+@app.get("/health", skip_middleware=[outer, record])
+async def health() -> str:
+    return "ok"
+
+
+users = Router()
+
+
+@users.get("/{user_id}", middleware=[only_here], skip_middleware=[outer])
+async def user(tenant: str, user_id: int) -> dict[str, Any]:
+    return {"tenant": tenant, "user_id": user_id}
+
+
+app.mount("/tenants/{tenant}/users", users)
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    calls.clear()
+    async with TestClient(app=app) as client:
+        yield client
+
+
+async def test_middleware_order(client: TestClient) -> None:
+    resp = await client.get("/items/1")
+    assert resp.json() == {"item_id": 1}
+    assert calls == ["outer", "record /items/1 {'item_id': '1'}", "only_here"]
+
+
+async def test_skipped_middleware(client: TestClient) -> None:
+    resp = await client.get("/health")
+    assert resp.text == "ok"
+    assert calls == []
+    assert app.routes[1].chain is None
+
+
+async def test_mounted_router_middleware(client: TestClient) -> None:
+    resp = await client.get("/tenants/acme/users/7")
+    assert resp.json() == {"tenant": "acme", "user_id": 7}
+    # Order of path params is not defined, they are checked by the response.
+    record_call, *rest = calls
+    assert record_call.startswith("record /tenants/acme/users/7 ")
+    assert rest == ["only_here"]
+
+
+async def test_not_found_middleware(client: TestClient) -> None:
+    resp = await client.get("/unknown")
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+    assert resp.headers["content-type"] == "application/json"
+    assert calls == ["outer", "record /unknown {}"]
+
+
+async def test_added_after_startup(client: TestClient) -> None:
+    async def late(request: Request, call_next: CallNext) -> Any:
+        calls.append("late")
+        return await call_next(request)
+
+    async def new() -> str:
+        return "new"
+
+    app.add_route(HTTPMethod.GET, "/new", new)
+    app.add_middleware(late)
+    try:
+        resp = await client.get("/new")
+    finally:
+        app._middleware.remove(late)  # noqa: SLF001
+    assert resp.text == "new"
+    assert calls == ["outer", "record /new {}", "late"]
@@ -0,0 +1,166 @@
+from collections.abc import AsyncGenerator
+from http import HTTPStatus
+from typing import Annotated, Any
+
+import msgspec
+import pytest
+from dependency_injector import containers, providers
+
+from pulya import Body, Pulya, RequestContainer, TestClient
+from pulya.cache import Cache
+from pulya.rsgi import Scope
+from pulya.serialization import is_msgpack, prefers_msgpack
+from tests.rsgi_test import StubHeaders, StubHTTPProtocol
+
+MSGPACK = "application/msgpack"
+
+
+class Item(msgspec.Struct):
+    name: str
+    tags: list[str]
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+app = Pulya(Container)
+
+
+@app.post("/items", msgpack=True)
+async def create(item: Annotated[Item, Body(Item)]) -> Item:
+    return item
+
+
+@app.post("/maybe")
+async def maybe(item: Annotated[Item | None, Body(Item | None)]) -> dict[str, Any]:
+    return {"item": item}
+
+
+@app.get("/cached", cache=Cache(ttl=60), msgpack=True)
+async def cached() -> dict[str, int]:
+    return {"answer": 42}
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    async with TestClient(app=app) as client:
+        yield client
+
+
+ITEM = Item(name="book", tags=["paper"])
+
+
+async def test_msgpack_request_and_response(client: TestClient) -> None:
+    resp = await client.post(
+        "/items",
+        content=msgspec.msgpack.encode(ITEM),
+        headers={"content-type": MSGPACK, "accept": MSGPACK},
+    )
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["content-type"] == MSGPACK
+    assert msgspec.msgpack.decode(resp.content, type=Item) == ITEM
+
+
+async def test_json_stays_default(client: TestClient) -> None:
+    resp = await client.post(
+        "/items",
+        content=msgspec.msgpack.encode(ITEM),
+        headers={"content-type": "application/x-msgpack; charset=binary"},
+    )
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == {"name": "book", "tags": ["paper"]}
+
+
+async def test_negotiation_is_opt_in(client: TestClient) -> None:
+    resp = await client.post(
+        "/maybe",
+        content=msgspec.msgpack.encode(ITEM),
+        headers={"content-type": MSGPACK, "accept": MSGPACK},
+    )
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == {"item": {"name": "book", "tags": ["paper"]}}
+
+
+async def test_empty_msgpack_body(client: TestClient) -> None:
+    resp = await client.post("/maybe", headers={"content-type": MSGPACK})
+    assert resp.json() == {"item": None}
+
+
+async def test_cached_responses_by_format(client: TestClient) -> None:
+    for _ in range(2):
+        resp = await client.get("/cached", headers={"accept": MSGPACK})
+        assert msgspec.msgpack.decode(resp.content) == {"answer": 42}
+        resp = await client.get("/cached")
+        assert resp.json() == {"answer": 42}
+
+
+class RecordingProtocol(StubHTTPProtocol):
+    def __init__(self, content: bytes) -> None:
+        super().__init__(content)
+        self.response: tuple[list[tuple[str, str]], bytes] | None = None
+
+    def response_bytes(
+        self,
+        status: int,  # noqa: ARG002
+        headers: list[tuple[str, str]],
+        body: bytes,
+    ) -> None:
+        self.response = (headers, body)
+
+
+@pytest.mark.parametrize(
+    ("accept", "content_type"),
+    [
+        ("application/json;q=0.5, application/msgpack", MSGPACK),
+        ("*/*", "application/json"),
+    ],
+)
+async def test_rsgi_negotiation(
+    client: TestClient,  # noqa: ARG001
+    accept: str,
+    content_type: str,
+) -> None:
+    protocol = RecordingProtocol(msgspec.msgpack.encode(ITEM))
+    await app.__rsgi__(
+        Scope(
+            proto="http",
+            rsgi_version="1.0",
+            http_version="1.1",
+            server="server",
+            client="client",
+            scheme="http",
+            method="POST",
+            path="/items",
+            query_string="",
+            headers=StubHeaders({"content-type": MSGPACK, "accept": accept}),
+        ),
+        protocol,
+    )
+    assert protocol.response is not None
+    headers, body = protocol.response
+    assert headers == [("content-type", content_type)]
+    decode = msgspec.msgpack.decode if content_type == MSGPACK else msgspec.json.decode
+    assert decode(body, type=Item) == ITEM
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, False),
+        ("application/json", False),
+        ("application/msgpack", True),
+        ("application/json, application/msgpack", False),
+        ("application/json;q=0.9, application/vnd.msgpack", True),
+        ("*/*;q=0.1, application/x-msgpack;q=0.5", True),
+        ("application/msgpack;q=bad, text/html", False),
+    ],
+)
+def test_prefers_msgpack(accept: str | None, expected: bool) -> None:  # noqa: FBT001
+    assert prefers_msgpack(accept) is expected
+
+
+def test_is_msgpack() -> None:
+    assert is_msgpack("Application/MsgPack; charset=binary")
+    assert not is_msgpack("application/json")
+    assert not is_msgpack(None)
@@ -0,0 +1,253 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from http import HTTPStatus
+from typing import Annotated, Any
+
+import msgspec
+import pytest
+from dependency_injector import containers, providers
+from dependency_injector.wiring import inject
+
+from pulya import Body, Header, Pulya, RequestContainer, TestClient
+from pulya.request import BodyTooLargeError, Request, active_request
+from pulya.rsgi import RSGIRequest, Scope
+from tests.rsgi_test import StubHeaders, StubHTTPProtocol
+
+
+class Container(containers.DeclarativeContainer):
+    wiring_config = containers.WiringConfiguration(modules=[__name__])
+
+    request = providers.Container(RequestContainer)
+
+
+class Item(msgspec.Struct):
+    name: str
+
+
+app = Pulya(Container, max_body_size=16)
+
+
+@app.post("/upload")
+async def upload(request: Request) -> dict[str, int]:
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+    return {"size": size}
+
+
+@app.post("/content")
+async def content(request: Request) -> bytes:
+    return await request.get_content()
+
+
+@app.post("/body")
+@inject
+async def body(
+    first: Annotated[Item, Body(Item)],
+    second: Annotated[Item, Body(Item)],
+    raw: Annotated[dict[str, str], Body(dict[str, str])],
+    x_name: Annotated[str | None, Header("x-name")],
+    tag: str | None = None,
+) -> dict[str, Any]:
+    return {
+        "same": first is second,
+        "first": first,
+        "raw": raw,
+        "x-name": x_name,
+        "tag": tag,
+    }
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    async with TestClient(app=app) as client:
+        yield client
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_stream(client: TestClient) -> None:
+    resp = await client.post("/upload", content=_chunks(b"a" * 8, b"b" * 8))
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json() == {"size": 16}
+
+
+async def test_content(client: TestClient) -> None:
+    resp = await client.post("/content", content=_chunks(b"a" * 8, b"b" * 8))
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.content == b"a" * 8 + b"b" * 8
+
+
+async def test_body_decoded_once_per_type(client: TestClient) -> None:
+    resp = await client.post(
+        "/body?tag=t", json={"name": "item"}, headers={"x-name": "a"}
+    )
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json() == {
+        "same": True,
+        "first": {"name": "item"},
+        "raw": {"name": "item"},
+        "x-name": "a",
+        "tag": "t",
+    }
+
+
+@pytest.mark.usefixtures("client")
+async def test_markers_resolved_by_dependency_injector() -> None:
+    """Handlers called outside of routes still get params from DI."""
+    request = _make_rsgi_request(StubHTTPProtocol(content=b'{"name": "item"}'))
+    token = active_request.set(request)
+    try:
+        result = await body()  # type: ignore[call-arg]
+    finally:
+        active_request.reset(token)
+    assert result == {
+        "same": True,
+        "first": Item(name="item"),
+        "raw": {"name": "item"},
+        "x-name": None,
+        "tag": None,
+    }
+
+
+async def test_declared_length_too_large(client: TestClient) -> None:
+    resp = await client.post("/upload", content=b"a" * 17)
+    assert resp.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert resp.headers["content-type"] == "application/json"
+
+
+async def test_streamed_body_too_large(client: TestClient) -> None:
+    resp = await client.post("/content", content=_chunks(b"a" * 8, b"b" * 9))
+    assert resp.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+def _rsgi_request(
+    path: str, protocol: StubHTTPProtocol, headers: dict[str, str]
+) -> None:
+    asyncio.run(
+        app.__rsgi__(
+            Scope(
+                proto="http",
+                rsgi_version="1.0",
+                http_version="2.0",
+                server="server",
+                client="client",
+                scheme="http",
+                method="POST",
+                path=path,
+                query_string="",
+                headers=StubHeaders(headers),
+            ),
+            protocol,
+        )
+    )
+
+
+class RecordingProtocol(StubHTTPProtocol):
+    status: int | None = None
+    body: bytes | None = None
+
+    def response_bytes(
+        self, status: int, headers: list[tuple[str, str]], body: bytes
+    ) -> None:
+        super().response_bytes(status, headers, body)
+        self.status = status
+        self.body = body
+
+
+@pytest.mark.parametrize("max_body_size", [None, 16])
+def test_rsgi_body(monkeypatch: pytest.MonkeyPatch, max_body_size: int | None) -> None:
+    monkeypatch.setattr(app, "max_body_size", max_body_size)
+
+    protocol = RecordingProtocol(chunks=[b"a" * 8, b"b" * 8])
+    _rsgi_request("/upload", protocol, {})
+    assert protocol.body == msgspec.json.encode({"size": 16})
+
+    protocol = RecordingProtocol(content=b"a" * 16)
+    _rsgi_request("/content", protocol, {"content-length": "16"})
+    assert protocol.body == b"a" * 16
+
+
+def test_rsgi_body_too_large() -> None:
+    protocol = RecordingProtocol(chunks=[b"a" * 8, b"b" * 9])
+    _rsgi_request("/content", protocol, {})
+    assert protocol.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+    protocol = RecordingProtocol(chunks=[b"a" * 17])
+    _rsgi_request("/upload", protocol, {"content-length": "17"})
+    assert protocol.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+class SlowProtocol(StubHTTPProtocol):
+    reads = 0
+
+    async def __call__(self) -> bytes:
+        self.reads += 1
+        await asyncio.sleep(0)
+        if self.content is None:
+            raise BodyTooLargeError
+        return self.content
+
+
+def _make_rsgi_request(protocol: StubHTTPProtocol) -> RSGIRequest:
+    scope = Scope(
+        proto="http",
+        rsgi_version="1.0",
+        http_version="2.0",
+        server="server",
+        client="client",
+        scheme="http",
+        method="POST",
+        path="/",
+        query_string="",
+        headers=StubHeaders(),
+    )
+    return RSGIRequest(scope, protocol)
+
+
+async def test_concurrent_content_reads() -> None:
+    protocol = SlowProtocol(content=b"body")
+    request = _make_rsgi_request(protocol)
+    contents = await asyncio.gather(request.get_content(), request.get_content())
+    assert list(contents) == [b"body", b"body"]
+    assert await request.get_content() == b"body"
+    assert protocol.reads == 1
+
+
+async def test_concurrent_content_read_error() -> None:
+    protocol = SlowProtocol()
+    request = _make_rsgi_request(protocol)
+    results = await asyncio.gather(
+        request.get_content(), request.get_content(), return_exceptions=True
+    )
+    assert [type(r) for r in results] == [BodyTooLargeError, BodyTooLargeError]
+
+
+async def test_cancelled_content_read() -> None:
+    protocol = SlowProtocol(content=b"body")
+    request = _make_rsgi_request(protocol)
+    first = asyncio.ensure_future(request.get_content())
+    second = asyncio.ensure_future(request.get_content())
+    cancelled_waiter = asyncio.ensure_future(request.get_content())
+    await asyncio.sleep(0)
+    cancelled_waiter.cancel()
+    first.cancel()
+    results = await asyncio.wait_for(
+        asyncio.gather(first, second, cancelled_waiter, return_exceptions=True), 1
+    )
+    assert [type(r) for r in results] == [asyncio.CancelledError] * 3
+    assert await asyncio.wait_for(request.get_content(), 1) == b"body"
+
+
+async def test_content_read_with_cancelled_waiter() -> None:
+    protocol = SlowProtocol(content=b"body")
+    request = _make_rsgi_request(protocol)
+    first = asyncio.ensure_future(request.get_content())
+    waiter = asyncio.ensure_future(request.get_content())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    assert await asyncio.wait_for(first, 1) == b"body"
+    assert waiter.cancelled()
@@ -0,0 +1,364 @@
+import asyncio
+import gc
+import os
+import threading
+import weakref
+from http import HTTPMethod
+from typing import Annotated, Any
+
+import msgspec
+import pytest
+from dependency_injector.wiring import Provide, inject
+
+from pulya import Header, Query, RequestContainer
+from pulya.asgi import ASGIRequest
+from pulya.executor import HandlerExecutor
+from pulya.request import Request, RequestValidationError, active_request
+from pulya.routing import Route, Router
+
+
+async def _receive() -> None:
+    raise NotImplementedError
+
+
+def _make_request(path: str, query_string: bytes = b"") -> Request:
+    return ASGIRequest(
+        {  # type: ignore[typeddict-item]
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query_string,
+            "headers": [],
+        },
+        _receive,  # type: ignore[arg-type]
+    )
+
+
+async def test_route_without_params() -> None:
+    async def handler() -> str:
+        return "ok"
+
+    route = Route(HTTPMethod.GET, "/some/{id}", handler)
+    assert not route.uses_di
+    assert await route.invoke(_make_request("/some/1"), {"id": "1"}) == "ok"
+
+
+async def test_route_typed_path_params() -> None:
+    async def handler(item_id: int, name: str) -> tuple[int, str]:
+        return item_id, name
+
+    route = Route(HTTPMethod.GET, "/items/{item_id}/{name}", handler)
+    params = {"item_id": "42", "name": "answer"}
+    assert await route.invoke(_make_request("/items/42/answer"), params) == (
+        42,
+        "answer",
+    )
+
+
+async def test_route_marker_in_default_sets_request_context() -> None:
+    async def handler(
+        name: str,
+        _request: Request = Provide[RequestContainer.request],
+    ) -> tuple[str, Request]:
+        return name, active_request.get()
+
+    route = Route(HTTPMethod.GET, "/users/{name}", handler)
+    assert route.uses_di
+    assert list(route.path_params_schema.__struct_fields__) == ["name"]
+
+    request = _make_request("/users/alice")
+    assert await route.invoke(request, {"name": "alice"}) == ("alice", request)
+    assert active_request.get(None) is None
+
+
+async def test_route_native_markers_skip_di() -> None:
+    @inject
+    async def handler(
+        x_name: Annotated[str | None, Header("x-name")],
+        request: Request,
+    ) -> tuple[str | None, str]:
+        return x_name, request.path
+
+    route = Route(HTTPMethod.GET, "/some", handler)
+    assert not route.uses_di
+    assert await route.invoke(_make_request("/some"), {}) == (None, "/some")
+
+
+async def test_route_query_params() -> None:
+    async def handler(
+        item_id: int,
+        limit: int = Query(default=10),
+        ids: Annotated[tuple[int, ...], Query("id")] = (),
+        *,
+        sort: Annotated[str, Query()],
+    ) -> dict[str, Any]:
+        return {"item_id": item_id, "limit": limit, "ids": ids, "sort": sort}
+
+    route = Route(HTTPMethod.GET, "/items/{item_id}", handler)
+    assert route.query_params_schema is not None
+    result = await route.invoke(
+        _make_request("/items/1", b"sort=name&id=1&id=2&limit=5"), {"item_id": "1"}
+    )
+    assert result == {"item_id": 1, "limit": 5, "ids": (1, 2), "sort": "name"}
+
+    result = await route.invoke(_make_request("/items/1", b"sort=id"), {"item_id": "1"})
+    assert result == {"item_id": 1, "limit": 10, "ids": (), "sort": "id"}
+
+    with pytest.raises(RequestValidationError) as exc_info:
+        await route.invoke(_make_request("/items/1"), {"item_id": "1"})
+    assert exc_info.value.location == "query"
+    assert exc_info.value.detail == "Object missing required field `sort`"
+    assert exc_info.value.path is None
+
+
+async def test_route_without_query_params() -> None:
+    async def handler(item_id: int) -> int:
+        return item_id
+
+    route = Route(HTTPMethod.GET, "/items/{item_id}", handler)
+    assert route.query_params_schema is None
+
+
+def test_routes_share_params_structs() -> None:
+    async def handler(item_id: int, limit: int = 10) -> int:
+        return item_id + limit
+
+    async def other(item_id: int, limit: int = 10) -> int:
+        return item_id - limit
+
+    first = Route(HTTPMethod.GET, "/items/{item_id}", handler)
+    second = Route(HTTPMethod.GET, "/items/{item_id}", handler)
+    third = Route(HTTPMethod.POST, "/other/{item_id}", other)
+    assert first.handler_type_hint is second.handler_type_hint
+    assert first.path_params_schema is third.path_params_schema
+    assert first.query_params_schema is third.query_params_schema
+    assert first.path_params_schema is not first.query_params_schema
+
+
+def test_introspection_does_not_keep_handlers_alive() -> None:
+    class Handler:
+        async def handle(self, item_id: int) -> int:
+            return item_id
+
+    handler = Handler()
+    first = Route(HTTPMethod.GET, "/items/{item_id}", handler.handle)
+    second = Route(HTTPMethod.GET, "/items/{item_id}", Handler().handle)
+    assert first.handler_type_hint is second.handler_type_hint
+    # Unbound function takes `self`, it is introspected on its own.
+    unbound = Route(HTTPMethod.GET, "/items/{item_id}", Handler.handle)
+    assert unbound.handler_type_hint is not first.handler_type_hint
+
+    alive = weakref.ref(handler)
+    del handler, first, second, unbound, Handler
+    gc.collect()
+    assert alive() is None
+
+
+async def test_query_param_constraints_with_marker() -> None:
+    async def handler(
+        ids: Annotated[tuple[int, ...], msgspec.Meta(max_length=2), Query("id")] = (),
+    ) -> tuple[int, ...]:
+        return ids
+
+    route = Route(HTTPMethod.GET, "/items", handler)
+    assert await route.invoke(_make_request("/items", b"id=1&id=2"), {}) == (1, 2)
+    with pytest.raises(RequestValidationError):
+        await route.invoke(_make_request("/items", b"id=1&id=2&id=3"), {})
+
+
+async def test_routes_with_unhashable_defaults() -> None:
+    async def handler(tags: list[str] = []) -> list[str]:  # noqa: B006
+        return tags
+
+    async def other(tags: list[str] = []) -> list[str]:  # noqa: B006
+        return tags
+
+    first = Route(HTTPMethod.GET, "/tags", handler)
+    second = Route(HTTPMethod.GET, "/tags", other)
+    assert first.query_params_schema is not second.query_params_schema
+    result = await first.invoke(_make_request("/tags", b"tags=a&tags=b"), {})
+    assert result == ["a", "b"]
+
+
+async def _handler() -> None:
+    raise NotImplementedError
+
+
+def test_router_static_and_dynamic_match() -> None:
+    router = Router()
+    router.add_route(HTTPMethod.GET, "/items/new", _handler)
+    router.add_route(HTTPMethod.GET, "/items/{item_id}", _handler)
+
+    static = router.match_route(HTTPMethod.GET, "/items/new")
+    assert static is not None
+    assert static[0].url_pattern == "/items/new"
+    assert static[1] == {}
+
+    dynamic = router.match_route(HTTPMethod.GET, "/items/1")
+    assert dynamic is not None
+    assert dynamic[0].url_pattern == "/items/{item_id}"
+    assert dynamic[1] == {"item_id": "1"}
+
+    assert router.match_route(HTTPMethod.GET, "/other") is None
+    assert router.match_route(HTTPMethod.POST, "/items/new") is None
+    assert HTTPMethod.POST not in router._routers_by_method  # noqa: SLF001
+
+
+def test_router_match_cache() -> None:
+    router = Router(match_cache_size=16)
+    router.add_route(HTTPMethod.GET, "/items/{item_id}", _handler)
+
+    first = router.match_route(HTTPMethod.GET, "/items/1")
+    assert router.match_route(HTTPMethod.GET, "/items/1") is first
+
+    # New routes drop cached matches.
+    router.add_route(HTTPMethod.GET, "/items/1", _handler)
+    match = router.match_route(HTTPMethod.GET, "/items/1")
+    assert match is not None
+    assert match[0].url_pattern == "/items/1"
+
+
+def test_router_mount_flattens_nested_routers() -> None:
+    users = Router()
+    users.add_route(
+        HTTPMethod.GET, "/{user_id}", _handler, execution="inline", msgpack=True
+    )
+    users.add_route(HTTPMethod.DELETE, "/{user_id}", _handler)
+    api = Router()
+    api.add_route(HTTPMethod.GET, "/health", _handler)
+    api.mount("/users", users)
+    router = Router()
+    router.mount("/api/", api)
+
+    assert [(r.method, r.url_pattern) for r in router.routes] == [
+        (HTTPMethod.GET, "/api/health"),
+        (HTTPMethod.GET, "/api/users/{user_id}"),
+        (HTTPMethod.DELETE, "/api/users/{user_id}"),
+    ]
+    match = router.match_route(HTTPMethod.GET, "/api/users/7")
+    assert match is not None
+    route, params = match
+    assert params == {"user_id": "7"}
+    assert route.execution == "inline"
+    assert route.msgpack
+    assert route.executor is router.executor
+    assert router.match_route(HTTPMethod.GET, "/api/health") is not None
+    assert router.match_route(HTTPMethod.GET, "/users/7") is None
+
+
+def test_router_mount_root_route() -> None:
+    api = Router()
+    api.add_route(HTTPMethod.GET, "/", _handler)
+    router = Router()
+    router.mount("/api/", api)
+    router.mount("/", api)
+
+    assert [r.url_pattern for r in router.routes] == ["/api", "/"]
+    assert router.match_route(HTTPMethod.GET, "/api") is not None
+    assert router.match_route(HTTPMethod.GET, "/api/") is None
+    assert router.match_route(HTTPMethod.GET, "/") is not None
+
+
+async def test_sync_handler_inline() -> None:
+    def handler(item_id: int) -> tuple[int, str]:
+        return item_id, threading.current_thread().name
+
+    route = Route(HTTPMethod.GET, "/items/{item_id}", handler, execution="inline")
+    result = await route.invoke(_make_request("/items/1"), {"item_id": "1"})
+    assert result == (1, threading.current_thread().name)
+
+
+async def test_sync_handler_default_executor() -> None:
+    def handler() -> str:
+        return threading.current_thread().name
+
+    route = Route(HTTPMethod.GET, "/thread", handler)
+    assert await route.invoke(_make_request("/thread"), {}) != (
+        threading.current_thread().name
+    )
+
+
+async def test_sync_handler_threadpool_keeps_request_context() -> None:
+    @inject
+    def handler(
+        name: str,
+        _request: Request = Provide[RequestContainer.request],
+    ) -> tuple[str, str, Request]:
+        return name, threading.current_thread().name, active_request.get()
+
+    router = Router(threadpool_size=2)
+    route = router.add_route(HTTPMethod.GET, "/users/{name}", handler)
+    request = _make_request("/users/john")
+    name, thread_name, active = await route.invoke(request, {"name": "john"})
+    assert (name, active) == ("john", request)
+    assert thread_name.startswith("pulya-handler")
+    assert router.executor.max_workers == 2  # noqa: PLR2004
+    assert router.executor.saturation == 0
+
+
+async def test_executor_saturation() -> None:
+    executor = HandlerExecutor(max_workers=2)
+    started = threading.Event()
+    release = threading.Event()
+
+    def block() -> None:
+        started.set()
+        release.wait()
+
+    task = asyncio.create_task(executor.run(block))
+    await asyncio.to_thread(started.wait)
+    assert executor.pending == 1
+    assert executor.saturation == 0.5  # noqa: PLR2004
+    release.set()
+    await task
+    assert executor.saturation == 0
+
+
+async def test_executor_shutdown_and_default_size() -> None:
+    executor = HandlerExecutor()
+    assert executor.max_workers == min(32, (os.cpu_count() or 1) + 4)
+    assert await executor.run(threading.get_ident) != threading.get_ident()
+    executor.shutdown(wait=True)
+    # Calls after shutdown start new threads.
+    assert await executor.run(dict, x=7) == {"x": 7}
+    executor.shutdown()
+
+
+class _Item(msgspec.Struct):
+    name: str
+
+
+async def _returns_any() -> Any:
+    return None
+
+
+def _handler_returning(hint: Any) -> Any:
+    async def handler() -> None:
+        return None
+
+    handler.__annotations__["return"] = hint
+    return handler
+
+
+@pytest.mark.parametrize(
+    ("handler", "content_type"),
+    [
+        (_handler_returning(dict[str, int]), "application/json"),
+        (_handler_returning(list[_Item]), "application/json"),
+        (_handler_returning(_Item | None), "application/json"),
+        (_handler_returning(Annotated[str, "meta"]), "text/plain"),
+        (_handler_returning(bytes), "text/plain"),
+        (_handler_returning(str | dict[str, str]), None),
+        (_returns_any, None),
+    ],
+)
+def test_content_headers_from_return_annotation(
+    handler: Any, content_type: str | None
+) -> None:
+    route = Route(HTTPMethod.GET, "/", handler)
+    if content_type is None:
+        assert route.content_headers is None
+    else:
+        assert route.content_headers is not None
+        assert route.content_headers.rsgi == [("content-type", content_type)]
+        assert route.content_headers.asgi == [(b"content-type", content_type.encode())]
@@ -1,26 +1,51 @@
 import asyncio
+import threading
 from collections import UserDict
 from collections.abc import AsyncIterator
 
 import msgspec
+import pytest
+from asgiref.typing import ASGIReceiveEvent, ASGISendEvent, HTTPScope
 
 from examples.simple_example import app
 from pulya.rsgi import Scope, Transport
 
 
+class StubTransport:
+    """RSGI transport object implementation for testing."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes | str] = []
+
+    async def send_bytes(self, content: bytes) -> None:
+        self.chunks.append(content)
+
+    async def send_str(self, content: str) -> None:
+        self.chunks.append(content)
+
+
 class StubHTTPProtocol:
     """RSGI protocol object implementation for testing."""
 
-    def __init__(self, content: bytes | None = None) -> None:
+    def __init__(
+        self, content: bytes | None = None, chunks: list[bytes] | None = None
+    ) -> None:
         self.content: bytes | None = content
+        self.chunks = chunks if chunks is not None else [content or b""]
+        self.transport = StubTransport()
+        self.file: tuple[int, str, tuple[int, int] | None] | None = None
 
     async def __call__(self) -> bytes:
         """__call__ to receive the entire body in bytes format."""
         return self.content or b""
 
-    async def __aiter__(self) -> AsyncIterator[bytes]:
+    def __aiter__(self) -> AsyncIterator[bytes]:
         """__aiter__ to receive the body in bytes chunks."""
-        raise NotImplementedError
+        return self._iter_chunks()
+
+    async def _iter_chunks(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            yield chunk
 
     async def client_disconnect(self) -> None:
         """Client_disconnect to watch for client disconnection."""
@@ -46,30 +71,37 @@ class StubHTTPProtocol:
         return
 
     def response_file(
-        self, status: int, headers: list[tuple[str, str]], file: str
+        self,
+        status: int,
+        headers: list[tuple[str, str]],  # noqa: ARG002
+        file: str,
     ) -> None:
         """Response_file to send back a file response (from its path)."""
-        raise NotImplementedError
+        self.file = (status, file, None)
 
     def response_file_range(
         self,
         status: int,
-        headers: list[tuple[str, str]],
+        headers: list[tuple[str, str]],  # noqa: ARG002
         file: str,
         start: int,
         end: int,
     ) -> None:
         """Response_file_range to send back a file range response (from its path)."""
-        raise NotImplementedError
+        self.file = (status, file, (start, end))
 
-    def response_stream(self, status: int, headers: list[tuple[str, str]]) -> Transport:
+    def response_stream(
+        self,
+        status: int,  # noqa: ARG002
+        headers: list[tuple[str, str]],  # noqa: ARG002
+    ) -> Transport:
         """Response_stream to start a stream response."""
-        raise NotImplementedError
+        return self.transport
 
 
 class StubHeaders(UserDict[str, str]):
     def get_all(self, name: str) -> list[str]:
-        return [self[name]]
+        return [self[name]] if name in self else []
 
 
 def test_rsgi_application() -> None:
@@ -165,4 +197,137 @@ def test_rsgi_application() -> None:
             StubHTTPProtocol(),
         )
     )
+    stream_protocol = StubHTTPProtocol()
+    event_loop.run_until_complete(
+        app.__rsgi__(
+            Scope(
+                proto="http",
+                rsgi_version="1.0",
+                http_version="2.0",
+                server="server",
+                client="client",
+                scheme="http",
+                method="GET",
+                path="/stream/",
+                query_string="",
+                headers=StubHeaders(),
+                authority=None,
+            ),
+            stream_protocol,
+        )
+    )
+    assert stream_protocol.transport.chunks == ["Hello ", b"in chunks!"]
+    event_loop.run_until_complete(
+        app.__rsgi__(
+            Scope(
+                proto="http",
+                rsgi_version="1.0",
+                http_version="2.0",
+                server="server",
+                client="client",
+                scheme="http",
+                method="GET",
+                path="/search/books",
+                query_string="q=python&p=2",
+                headers=StubHeaders(),
+                authority=None,
+            ),
+            StubHTTPProtocol(),
+        )
+    )
     app.__rsgi_del__(event_loop)
+
+
+class HeadersProtocol(StubHTTPProtocol):
+    headers: list[tuple[str, str]] | None = None
+
+    def response_bytes(
+        self,
+        status: int,  # noqa: ARG002
+        headers: list[tuple[str, str]],
+        body: bytes,  # noqa: ARG002
+    ) -> None:
+        self.headers = headers
+
+
+async def _rsgi_headers(path: str) -> list[tuple[str, str]]:
+    protocol = HeadersProtocol()
+    await app.__rsgi__(
+        Scope(
+            proto="http",
+            rsgi_version="1.0",
+            http_version="1.1",
+            server="server",
+            client="client",
+            scheme="http",
+            method="GET",
+            path=path,
+            query_string="",
+            headers=StubHeaders(),
+        ),
+        protocol,
+    )
+    assert protocol.headers is not None
+    return protocol.headers
+
+
+async def _asgi_headers(path: str) -> list[tuple[str, str]]:
+    sent: list[ASGISendEvent] = []
+
+    async def receive() -> ASGIReceiveEvent:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(event: ASGISendEvent) -> None:
+        sent.append(event)
+
+    scope: HTTPScope = {  # type: ignore[typeddict-item]
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [],
+    }
+    await app(scope, receive, send)
+    start = sent[0]
+    assert start["type"] == "http.response.start"
+    return [(k.decode(), v.decode()) for k, v in start["headers"]]
+
+
+@pytest.mark.parametrize(
+    ("path", "content_type"),
+    [
+        ("/plain_response/", "text/plain"),
+        ("/bytes/", "text/plain"),
+        ("/", "application/json"),
+    ],
+)
+async def test_adapters_agree_on_content_type(path: str, content_type: str) -> None:
+    await app.on_startup()
+    try:
+        for headers in [await _rsgi_headers(path), await _asgi_headers(path)]:
+            assert headers == [("content-type", content_type)]
+    finally:
+        await app.on_shutdown()
+
+
+def test_thread_workers_share_container() -> None:
+    """Thread workers start the application once and share its container."""
+    started = threading.Barrier(2)
+    containers: list[object] = []
+
+    def worker() -> None:
+        event_loop = asyncio.new_event_loop()
+        app.__rsgi_init__(event_loop)
+        started.wait()
+        containers.append(app.container)
+        started.wait()
+        app.__rsgi_del__(event_loop)
+        event_loop.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(containers) == 2  # noqa: PLR2004
+    assert containers[0] is containers[1]
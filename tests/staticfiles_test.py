@@ -0,0 +1,233 @@
+import asyncio
+import gzip
+from collections.abc import AsyncGenerator
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+
+import pytest
+from asgiref.typing import ASGISendEvent, HTTPScope
+from dependency_injector import containers, providers
+
+from pulya import Pulya, RequestContainer, TestClient
+from pulya.asgi import FILE_CHUNK_SIZE
+from pulya.middleware import CallNext
+from pulya.request import Request
+from pulya.rsgi import Scope
+from pulya.staticfiles import StaticFiles, accepted_encodings, parse_range
+from tests.rsgi_test import StubHeaders, StubHTTPProtocol
+
+CSS = b"body { color: red; }"
+LARGE = bytes(range(256)) * (FILE_CHUNK_SIZE // 128)
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+@pytest.fixture
+def static_dir(tmp_path: Path) -> Path:
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "app.css").write_bytes(CSS)
+    (tmp_path / "css" / "app.css.gz").write_bytes(gzip.compress(CSS))
+    (tmp_path / "css" / "app.css.br").write_bytes(b"brotli")
+    (tmp_path / "large.bin").write_bytes(LARGE)
+    (tmp_path / "archive.tar.gz").write_bytes(b"archive")
+    return tmp_path
+
+
+@pytest.fixture
+def app(static_dir: Path) -> Pulya[Container]:
+    app = Pulya(Container)
+    app.mount_static("/static/", StaticFiles(static_dir))
+    return app
+
+
+@pytest.fixture
+async def client(app: Pulya[Container]) -> AsyncGenerator[TestClient, Any]:
+    async with TestClient(app=app, headers={"accept-encoding": "identity"}) as client:
+        yield client
+
+
+def test_index(static_dir: Path) -> None:
+    static = StaticFiles(static_dir)
+    assert set(static.index) == {"css/app.css", "large.bin", "archive.tar.gz"}
+    assert list(static.index["css/app.css"].encoded) == ["br", "gzip"]
+
+
+async def test_get(client: TestClient) -> None:
+    resp = await client.get("/static/css/app.css")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.content == CSS
+    assert resp.headers["content-type"] == "text/css"
+    assert resp.headers["content-length"] == str(len(CSS))
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert "content-encoding" not in resp.headers
+
+
+async def test_large_file_in_chunks(client: TestClient) -> None:
+    resp = await client.get("/static/large.bin")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.content == LARGE
+    assert resp.headers["content-type"] == "application/octet-stream"
+
+
+async def test_not_found(client: TestClient) -> None:
+    resp = await client.get("/static/missing.css")
+    assert resp.status_code == HTTPStatus.NOT_FOUND
+    assert resp.headers["content-type"] == "application/json"
+
+
+async def test_precompressed(client: TestClient) -> None:
+    resp = await client.get(
+        "/static/css/app.css", headers={"accept-encoding": "gzip, br;q=0"}
+    )
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "accept-encoding"
+    assert resp.content == CSS
+
+    async with client.stream(
+        "GET", "/static/css/app.css", headers={"accept-encoding": "br"}
+    ) as resp:
+        assert resp.headers["content-encoding"] == "br"
+        assert resp.headers["content-length"] == str(len(b"brotli"))
+
+    resp = await client.get("/static/css/app.css", headers={"accept-encoding": "zstd"})
+    assert "content-encoding" not in resp.headers
+
+
+async def test_not_modified(client: TestClient) -> None:
+    resp = await client.get("/static/css/app.css")
+    etag = resp.headers["etag"]
+
+    resp = await client.get("/static/css/app.css", headers={"if-none-match": etag})
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+    assert resp.content == b""
+
+    resp = await client.get("/static/css/app.css", headers={"if-none-match": "*"})
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+
+    resp = await client.get("/static/css/app.css", headers={"if-none-match": '"x"'})
+    assert resp.status_code == HTTPStatus.OK
+
+
+async def test_range(client: TestClient) -> None:
+    resp = await client.get("/static/css/app.css", headers={"range": "bytes=0-3"})
+    assert resp.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert resp.content == CSS[:4]
+    assert resp.headers["content-range"] == f"bytes 0-3/{len(CSS)}"
+    assert resp.headers["content-length"] == "4"
+
+    resp = await client.get("/static/css/app.css", headers={"range": "bytes=-5"})
+    assert resp.content == CSS[-5:]
+
+    resp = await client.get("/static/large.bin", headers={"range": "bytes=10-"})
+    assert resp.content == LARGE[10:]
+
+
+async def test_range_not_satisfiable(client: TestClient) -> None:
+    resp = await client.get("/static/css/app.css", headers={"range": "bytes=100-"})
+    assert resp.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert resp.headers["content-range"] == f"bytes */{len(CSS)}"
+
+    resp = await client.get("/static/css/app.css", headers={"range": "bytes=5-1"})
+    assert resp.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+
+
+async def test_multiple_ranges_ignored(client: TestClient) -> None:
+    resp = await client.get("/static/css/app.css", headers={"range": "bytes=0-1,3-4"})
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.content == CSS
+
+
+async def test_head(client: TestClient) -> None:
+    resp = await client.head("/static/css/app.css")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.content == b""
+    assert resp.headers["content-length"] == str(len(CSS))
+
+
+async def test_middleware_does_not_alter_index(
+    app: Pulya[Container], client: TestClient
+) -> None:
+    async def request_id(request: Request, call_next: CallNext) -> Any:
+        response = await call_next(request)
+        response.headers.append(("x-request-id", "1"))
+        return response
+
+    app.add_middleware(request_id)
+    requests = [
+        {"accept-encoding": "identity"},
+        {"accept-encoding": "gzip"},
+        {"range": "bytes=0-1,3-4"},
+    ]
+    for headers in requests * 2:
+        resp = await client.get("/static/css/app.css", headers=headers)
+        assert resp.headers.get_list("x-request-id") == ["1"]
+
+
+async def test_asgi_pathsend(app: Pulya[Container], static_dir: Path) -> None:
+    sent: list[ASGISendEvent] = []
+
+    async def receive() -> None:
+        raise NotImplementedError
+
+    async def send(event: ASGISendEvent) -> None:
+        sent.append(event)
+
+    scope: HTTPScope = {  # type: ignore[typeddict-item]
+        "type": "http",
+        "method": "GET",
+        "path": "/static/large.bin",
+        "headers": [],
+        "extensions": {"http.response.pathsend": {}},
+    }
+    await app(scope, receive, send)  # type: ignore[arg-type]
+    assert sent[-1] == {
+        "type": "http.response.pathsend",
+        "path": str(static_dir.resolve() / "large.bin"),
+    }
+
+
+def test_rsgi_file_responses(app: Pulya[Container], static_dir: Path) -> None:
+    def request(headers: dict[str, str]) -> StubHTTPProtocol:
+        protocol = StubHTTPProtocol()
+        asyncio.run(
+            app.__rsgi__(
+                Scope(
+                    proto="http",
+                    rsgi_version="1.0",
+                    http_version="2.0",
+                    server="server",
+                    client="client",
+                    scheme="http",
+                    method="GET",
+                    path="/static/css/app.css",
+                    query_string="",
+                    headers=StubHeaders(headers),
+                ),
+                protocol,
+            )
+        )
+        return protocol
+
+    path = str(static_dir.resolve() / "css" / "app.css")
+    assert request({}).file == (HTTPStatus.OK, path, None)
+    assert request({"range": "bytes=1-2"}).file == (
+        HTTPStatus.PARTIAL_CONTENT,
+        path,
+        (1, 3),
+    )
+
+
+def test_parse_range() -> None:
+    assert parse_range("bytes=0-0", 10) == (0, 1)
+    assert parse_range("bytes=2-100", 10) == (2, 10)
+    assert parse_range("bytes=-100", 10) == (0, 10)
+    assert parse_range("items=0-1", 10) is None
+    assert parse_range("bytes=a-b", 10) == (0, 0)
+
+
+def test_accepted_encodings() -> None:
+    assert accepted_encodings("gzip, BR;q=0.5, deflate;q=0") == {"gzip", "br"}
@@ -0,0 +1,155 @@
+import io
+from collections.abc import AsyncGenerator
+from typing import Annotated, Any
+
+import msgspec
+import pytest
+from dependency_injector import containers, providers
+from dependency_injector.wiring import Provide, inject
+
+from pulya import Header, Pulya, RequestContainer, TestClient
+from pulya.middleware import CallNext
+from pulya.request import Request
+from pulya.rsgi import Scope
+from pulya.tracing import RingBuffer, SpanExporter, Tracer
+from tests.rsgi_test import StubHeaders, StubHTTPProtocol
+
+
+class Container(containers.DeclarativeContainer):
+    wiring_config = containers.WiringConfiguration(modules=[__name__])
+
+    request = providers.Container(RequestContainer)
+
+
+buffer = RingBuffer(capacity=3)
+app = Pulya(Container, tracer=Tracer(buffer))
+
+
+async def passthrough(request: Request, call_next: CallNext) -> Any:
+    return await call_next(request)
+
+
+@app.get("/items/{item_id}")
+async def item(
+    item_id: int,
+    x_user: Annotated[str, Header("X-User", "anonymous")],
+    fields: str = "all",
+) -> dict[str, Any]:
+    return {"item_id": item_id, "user": x_user, "fields": fields}
+
+
+@app.get("/path")
+@inject
+async def path(request: Annotated[Request, Provide[RequestContainer.request]]) -> str:
+    return request.path
+
+
+@app.get("/wrapped", middleware=[passthrough])
+async def wrapped() -> bytes:
+    return b"ok"
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    buffer.traces.clear()
+    async with TestClient(app=app) as client:
+        yield client
+
+
+def _stage_names(index: int = -1) -> list[str]:
+    return [stage for stage, _, _ in list(buffer)[index].stages()]
+
+
+async def test_route_stages(client: TestClient) -> None:
+    resp = await client.get("/items/1?fields=name", headers={"X-User": "john"})
+    assert resp.json() == {"item_id": 1, "user": "john", "fields": "name"}
+    assert _stage_names() == [
+        "match",
+        "convert",
+        "inject",
+        "handler",
+        "serialize",
+        "send",
+    ]
+    trace = next(iter(buffer))
+    assert (trace.method, trace.path, trace.route) == (
+        "GET",
+        "/items/1",
+        "/items/{item_id}",
+    )
+    stages = trace.stages()
+    assert stages[0][1] == trace.start
+    assert all(start <= end for _, start, end in stages)
+
+
+async def test_di_route_is_traced(client: TestClient) -> None:
+    resp = await client.get("/path")
+    assert resp.text == "/path"
+    assert len(_stage_names()) == 6  # noqa: PLR2004
+
+
+async def test_middleware_route_stages(client: TestClient) -> None:
+    resp = await client.get("/wrapped")
+    assert resp.content == b"ok"
+    assert _stage_names() == ["match", "handler", "serialize", "send"]
+
+
+async def test_ring_buffer_keeps_last(client: TestClient) -> None:
+    for i in range(5):
+        await client.get(f"/items/{i}")
+    await client.get("/missing")
+    assert len(buffer) == 3  # noqa: PLR2004
+    assert [t.route for t in buffer] == ["/items/{item_id}", "/items/{item_id}", None]
+
+
+async def test_rsgi_request_is_traced(client: TestClient) -> None:  # noqa: ARG001
+    await app.__rsgi__(
+        Scope(
+            proto="http",
+            rsgi_version="1.0",
+            http_version="1.1",
+            server="server",
+            client="client",
+            scheme="http",
+            method="GET",
+            path="/items/7",
+            query_string="",
+            headers=StubHeaders(),
+        ),
+        StubHTTPProtocol(),
+    )
+    assert list(buffer)[-1].path == "/items/7"
+    assert _stage_names()[-1] == "send"
+
+
+def test_sampling() -> None:
+    sink = RingBuffer()
+    tracer = Tracer(sink, sample_every=3)
+    request = StubRequest()
+    traces = [tracer.start(request) for _ in range(6)]  # type: ignore[arg-type]
+    assert [t is not None for t in traces] == [True, False, False] * 2
+
+
+def test_span_exporter() -> None:
+    stream = io.BytesIO()
+    tracer = Tracer(SpanExporter(stream))
+    trace = tracer.start(StubRequest())  # type: ignore[arg-type]
+    assert trace is not None
+    trace.route = "/items/{item_id}"
+    trace.mark("match")
+    trace.mark("handler")
+    trace.finish()
+    Tracer(SpanExporter(stream)).start(StubRequest()).finish()  # type: ignore[arg-type, union-attr]
+
+    first, second = map(msgspec.json.decode, stream.getvalue().splitlines())
+    assert first["name"] == "GET /items/{item_id}"
+    assert [s["name"] for s in first["spans"]] == ["match", "handler"]
+    assert first["duration_ns"] == sum(s["duration_ns"] for s in first["spans"])
+    assert second["name"] == "GET /items/1"
+    assert second["spans"] == []
+    assert second["duration_ns"] == 0
+
+
+class StubRequest:
+    method = "GET"
+    path = "/items/1"
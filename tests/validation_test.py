@@ -0,0 +1,71 @@
+from collections.abc import AsyncGenerator
+from http import HTTPStatus
+from typing import Annotated, Any
+
+import msgspec
+import pytest
+from dependency_injector import containers, providers
+
+from pulya import Body, Pulya, RequestContainer, TestClient
+
+
+class Item(msgspec.Struct):
+    name: str
+    price: int
+
+
+class Order(msgspec.Struct):
+    items: list[Item]
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+app = Pulya(Container)
+
+
+@app.post("/orders/{order_id}")
+async def create(order_id: int, order: Annotated[Order, Body(Order)]) -> Order:
+    assert order_id
+    return order
+
+
+@pytest.fixture
+async def client() -> AsyncGenerator[TestClient, Any]:
+    async with TestClient(app=app) as client:
+        yield client
+
+
+async def test_invalid_body(client: TestClient) -> None:
+    resp = await client.post(
+        "/orders/1", json={"items": [{"name": "book", "price": "free"}]}
+    )
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == {
+        "error": "Request validation failed.",
+        "location": "body",
+        "detail": "Expected `int`, got `str`",
+        "path": "$.items[0].price",
+    }
+
+
+async def test_malformed_body(client: TestClient) -> None:
+    resp = await client.post("/orders/1", content=b"{not json")
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert resp.json()["location"] == "body"
+
+
+async def test_invalid_path_param(client: TestClient) -> None:
+    resp = await client.post("/orders/first", json={"items": []})
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    data = resp.json()
+    assert (data["location"], data["path"]) == ("path", "$.order_id")
+
+
+async def test_valid_body(client: TestClient) -> None:
+    order = {"items": [{"name": "book", "price": 10}]}
+    resp = await client.post("/orders/1", json=order)
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json() == order
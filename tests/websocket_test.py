@@ -0,0 +1,291 @@
+from collections.abc import AsyncGenerator
+from typing import Annotated, Any
+
+import msgspec
+import pytest
+from asgiref.typing import (
+    ASGI3Application,
+    ASGIReceiveEvent,
+    ASGISendEvent,
+    WebSocketConnectEvent,
+    WebSocketDisconnectEvent,
+    WebSocketReceiveEvent,
+    WebSocketScope,
+)
+from dependency_injector import containers, providers
+
+from pulya import Header, Pulya, RequestContainer, WebSocket
+from pulya.middleware import CallNext
+from pulya.request import Request
+from pulya.rsgi import Scope
+from pulya.websocket import NORMAL_CLOSURE, POLICY_VIOLATION
+from tests.rsgi_test import StubHeaders
+
+
+class Container(containers.DeclarativeContainer):
+    request = providers.Container(RequestContainer)
+
+
+class Message(msgspec.Struct):
+    room: str
+    text: str
+
+
+app = Pulya(Container)
+http_calls: list[str] = []
+
+
+async def http_only(request: Request, call_next: CallNext) -> Any:
+    http_calls.append(request.path)
+    return await call_next(request)
+
+
+app.add_middleware(http_only)
+
+
+async def count(websocket: Request, call_next: CallNext) -> Any:
+    websocket.cache["middleware"] = True
+    return await call_next(websocket)
+
+
+@app.websocket("/json/{room}")
+async def json_echo(
+    websocket: WebSocket,
+    room: str,
+    user: Annotated[str | None, Header("x-user")],
+    prefix: str = "",
+) -> None:
+    await websocket.send_str(f"hello {user}")
+    while True:
+        message = await websocket.receive_json(Message)
+        assert message.room == room
+        await websocket.send_json(Message(room=room, text=prefix + message.text))
+
+
+@app.websocket("/msgpack")
+async def msgpack_echo(websocket: WebSocket) -> None:
+    message = await websocket.receive_msgpack(Message)
+    await websocket.send_msgpack(message)
+    await websocket.send_bytes(await websocket.receive_bytes())
+
+
+@app.websocket("/iterate", middleware=[count])
+async def iterate(websocket: WebSocket) -> None:
+    assert websocket.method == "GET"
+    assert websocket.cache["middleware"]
+    received = [message async for message in websocket]
+    assert received == ["a", b"b"]
+    assert await websocket.get_content() == b""
+    assert [chunk async for chunk in websocket.stream()] == []
+
+
+@app.websocket("/numbers/{n}")
+async def numbers(websocket: WebSocket, n: int) -> None:
+    await websocket.send_str(str(n))
+
+
+@pytest.fixture(autouse=True)
+async def _started() -> AsyncGenerator[None, Any]:
+    await app.on_startup()
+    yield
+    await app.on_shutdown()
+
+
+def text_event(text: str) -> WebSocketReceiveEvent:
+    return WebSocketReceiveEvent(type="websocket.receive", bytes=None, text=text)
+
+
+def bytes_event(data: bytes) -> WebSocketReceiveEvent:
+    return WebSocketReceiveEvent(type="websocket.receive", bytes=data, text=None)
+
+
+DISCONNECT = WebSocketDisconnectEvent(
+    type="websocket.disconnect", code=NORMAL_CLOSURE, reason=None
+)
+
+
+async def asgi_session(
+    path: str,
+    messages: list[ASGIReceiveEvent],
+    query_string: bytes = b"",
+    asgi_app: ASGI3Application = app,
+) -> list[ASGISendEvent]:
+    """Run websocket connection to ASGI application, return sent events."""
+    incoming: list[ASGIReceiveEvent] = [
+        WebSocketConnectEvent(type="websocket.connect"),
+        *messages,
+    ]
+    sent: list[ASGISendEvent] = []
+
+    async def receive() -> ASGIReceiveEvent:
+        return incoming.pop(0)
+
+    async def send(event: ASGISendEvent) -> None:
+        sent.append(event)
+
+    scope: WebSocketScope = {  # type: ignore[typeddict-item]
+        "type": "websocket",
+        "path": path,
+        "query_string": query_string,
+        "headers": [(b"x-user", b"bob")],
+    }
+    await asgi_app(scope, receive, send)
+    return sent
+
+
+def _text(message: Message) -> str:
+    return msgspec.json.encode(message).decode()
+
+
+async def test_asgi_json() -> None:
+    sent = await asgi_session(
+        "/json/news",
+        [
+            text_event(_text(Message("news", "hi"))),
+            DISCONNECT,
+        ],
+        query_string=b"prefix=re:",
+    )
+    assert sent == [
+        {"type": "websocket.accept", "subprotocol": None, "headers": []},
+        {"type": "websocket.send", "bytes": None, "text": "hello bob"},
+        {
+            "type": "websocket.send",
+            "bytes": None,
+            "text": _text(Message("news", "re:hi")),
+        },
+    ]
+
+
+async def test_asgi_msgpack() -> None:
+    packed = msgspec.msgpack.encode(Message("news", "hi"))
+    sent = await asgi_session(
+        "/msgpack",
+        [
+            bytes_event(packed),
+            text_event("raw"),
+        ],
+    )
+    assert [event.get("bytes") for event in sent[1:3]] == [packed, b"raw"]
+    assert sent[3] == {
+        "type": "websocket.close",
+        "code": NORMAL_CLOSURE,
+        "reason": None,
+    }
+
+
+async def test_asgi_iterate() -> None:
+    sent = await asgi_session(
+        "/iterate",
+        [
+            text_event("a"),
+            bytes_event(b"b"),
+            DISCONNECT,
+        ],
+    )
+    # Closed by the client, nothing to send back.
+    assert [event["type"] for event in sent] == ["websocket.accept"]
+    # Application middleware is not applied to websockets.
+    assert http_calls == []
+
+
+async def test_asgi_invalid_params() -> None:
+    sent = await asgi_session("/numbers/abc", [])
+    assert sent == [
+        {"type": "websocket.close", "code": POLICY_VIOLATION, "reason": None},
+    ]
+
+
+async def test_asgi_not_found() -> None:
+    sent = await asgi_session("/unknown", [])
+    assert sent == [
+        {"type": "websocket.close", "code": POLICY_VIOLATION, "reason": None},
+    ]
+
+
+class StubWebsocketMessage:
+    def __init__(self, kind: int, data: bytes | str) -> None:
+        self.kind = kind
+        self.data = data
+
+
+class StubWebsocketTransport:
+    def __init__(self, messages: list[StubWebsocketMessage]) -> None:
+        self.messages = messages
+        self.sent: list[bytes | str] = []
+
+    async def receive(self) -> StubWebsocketMessage:
+        return self.messages.pop(0)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def send_str(self, data: str) -> None:
+        self.sent.append(data)
+
+
+class StubWebsocketProtocol:
+    def __init__(self, messages: list[StubWebsocketMessage]) -> None:
+        self.transport = StubWebsocketTransport(messages)
+        self.accepted = False
+        self.closed: int | None = None
+
+    async def accept(self) -> StubWebsocketTransport:
+        self.accepted = True
+        return self.transport
+
+    def close(self, status: int | None) -> tuple[int, bool]:
+        self.closed = status
+        return status or 0, True
+
+
+def _rsgi_scope(path: str, query_string: str = "") -> Scope:
+    return Scope(
+        proto="ws",
+        rsgi_version="1.0",
+        http_version="1.1",
+        server="server",
+        client="client",
+        scheme="http",
+        method="GET",
+        path=path,
+        query_string=query_string,
+        headers=StubHeaders({"x-user": "bob"}),
+    )
+
+
+@pytest.mark.parametrize(
+    ("path", "messages", "expected"),
+    [
+        (
+            "/json/news",
+            [
+                StubWebsocketMessage(2, _text(Message("news", "hi"))),
+                StubWebsocketMessage(0, ""),
+            ],
+            ["hello bob", _text(Message("news", "hi"))],
+        ),
+        (
+            "/msgpack",
+            [
+                StubWebsocketMessage(1, msgspec.msgpack.encode(Message("a", "b"))),
+                StubWebsocketMessage(1, b"raw"),
+            ],
+            [msgspec.msgpack.encode(Message("a", "b")), b"raw"],
+        ),
+    ],
+)
+async def test_rsgi(
+    path: str, messages: list[StubWebsocketMessage], expected: list[Any]
+) -> None:
+    protocol = StubWebsocketProtocol(messages)
+    await app.__rsgi__(_rsgi_scope(path), protocol)
+    assert protocol.accepted
+    assert protocol.transport.sent == expected
+
+
+async def test_rsgi_not_found() -> None:
+    protocol = StubWebsocketProtocol([])
+    await app.__rsgi__(_rsgi_scope("/unknown"), protocol)
+    assert not protocol.accepted
+    assert protocol.closed == POLICY_VIOLATION
@@ -0,0 +1,118 @@
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from types import ModuleType
+from typing import Annotated
+
+import pytest
+from dependency_injector import containers, providers
+from dependency_injector.wiring import Provide, _is_patched
+
+from pulya import Pulya, RequestContainer
+from pulya.wiring import uses_markers, wired_modules
+
+#: Makes this module count as using markers.
+user: Annotated[str, Provide["user"]]
+
+
+def _module(**members: object) -> ModuleType:
+    module = ModuleType("fake")
+    vars(module).update(members)
+    return module
+
+
+def _with_default(user: str = Provide["user"]) -> str:
+    return user
+
+
+class _WithAnnotatedClassmethod:
+    @classmethod
+    def method(cls, user: Annotated[str, Provide["user"]]) -> str:
+        raise NotImplementedError
+
+
+class _WithoutMarkers:
+    name = "plain"
+
+    def method(self, user: str) -> str:
+        raise NotImplementedError
+
+
+@pytest.mark.parametrize(
+    ("module", "expected"),
+    [
+        (_module(), False),
+        (_module(name="plain", cls=_WithoutMarkers, func=uses_markers), False),
+        (_module(user=Provide["user"]), True),
+        (_module(__annotations__={"user": Annotated[str, Provide["user"]]}), True),
+        (_module(func=_with_default), True),
+        (_module(cls=_WithAnnotatedClassmethod), True),
+    ],
+)
+def test_uses_markers(module: ModuleType, *, expected: bool) -> None:
+    assert uses_markers(module) is expected
+
+
+@pytest.fixture
+def package(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    root = tmp_path / "wired_package"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    (root / "handlers.py").write_text(
+        "from dependency_injector.wiring import Provide\n\n\n"
+        "def handler(user: str = Provide['user']) -> str:\n"
+        "    return user\n"
+    )
+    (root / "plain.py").write_text("def helper(user: str) -> str:\n    return user\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    yield root.name
+    for name in list(sys.modules):
+        if name.startswith(root.name):
+            del sys.modules[name]
+
+
+def _container(**config: object) -> containers.DeclarativeContainer:
+    class Container(containers.DeclarativeContainer):
+        wiring_config = containers.WiringConfiguration(**config)  # type: ignore[arg-type]
+
+        user = providers.Object("alice")
+
+    return Container()
+
+
+def _names(modules: list[ModuleType]) -> list[str]:
+    return [module.__name__ for module in modules]
+
+
+def test_wired_modules_of_packages(package: str) -> None:
+    container = _container(packages=[package, f"{package}.plain"])
+    assert _names(wired_modules(container)) == [f"{package}.handlers"]
+
+
+def test_wired_modules_relative_and_objects(package: str) -> None:
+    container = _container(modules=[".handlers", ".plain"], from_package=package)
+    assert _names(wired_modules(container)) == [f"{package}.handlers"]
+
+    this_module = sys.modules[__name__]
+    container = _container(modules=["." + __name__.rpartition(".")[2]])
+    assert wired_modules(container) == [this_module]
+
+    container = _container(modules=[this_module])
+    assert wired_modules(container) == [this_module]
+
+
+async def test_startup_wires_only_modules_with_markers(package: str) -> None:
+    class Container(containers.DeclarativeContainer):
+        wiring_config = containers.WiringConfiguration(packages=[package])
+
+        request = providers.Container(RequestContainer)
+        user = providers.Object("alice")
+
+    app = Pulya(Container)
+    await app.on_startup()
+    handlers = sys.modules[f"{package}.handlers"]
+    plain = sys.modules[f"{package}.plain"]
+    assert _is_patched(handlers.handler)
+    assert handlers.handler() == "alice"
+    assert not _is_patched(plain.helper)
+    await app.on_shutdown()